@@ -0,0 +1,35 @@
+"""Name prefix indexes for TUI pickers
+
+Revision ID: 3bdc67ae9bdb
+Revises: 6150e5940ba0
+Create Date: 2026-10-18 17:41:12.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3bdc67ae9bdb'
+down_revision: Union[str, None] = '6150e5940ba0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_students_fullname', 'students', ['fullname'], unique=False,
+                    postgresql_ops={'fullname': 'text_pattern_ops'})
+    op.create_index('ix_teachers_fullname', 'teachers', ['fullname'], unique=False,
+                    postgresql_ops={'fullname': 'text_pattern_ops'})
+    op.create_index('ix_subjects_name', 'subjects', ['name'], unique=False,
+                    postgresql_ops={'name': 'text_pattern_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_subjects_name', table_name='subjects')
+    op.drop_index('ix_teachers_fullname', table_name='teachers')
+    op.drop_index('ix_students_fullname', table_name='students')
@@ -0,0 +1,38 @@
+"""Ranked student averages for top-K queries
+
+Revision ID: 6150e5940ba0
+Revises: b5c5c16a5651
+Create Date: 2026-10-18 11:48:05.913402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6150e5940ba0'
+down_revision: Union[str, None] = 'b5c5c16a5651'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('student_stats', sa.Column('avg_grade', sa.Numeric(precision=5, scale=2), nullable=True))
+    op.add_column('student_subject_stats', sa.Column('avg_grade', sa.Numeric(precision=5, scale=2), nullable=True))
+    op.execute("UPDATE student_stats SET avg_grade = round(grade_sum / grade_count, 2)")
+    op.execute("UPDATE student_subject_stats SET avg_grade = round(grade_sum / grade_count, 2)")
+    op.create_index(op.f('ix_student_stats_avg_grade'), 'student_stats', ['avg_grade'], unique=False)
+    op.create_index(
+        'ix_student_subject_stats_subject_avg', 'student_subject_stats', ['subject_id', 'avg_grade'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_student_subject_stats_subject_avg', table_name='student_subject_stats')
+    op.drop_index(op.f('ix_student_stats_avg_grade'), table_name='student_stats')
+    op.drop_column('student_subject_stats', 'avg_grade')
+    op.drop_column('student_stats', 'avg_grade')
@@ -0,0 +1,43 @@
+"""Trigram name search indexes
+
+Revision ID: 9d4f0b6e21c7
+Revises: 3bdc67ae9bdb
+Create Date: 2026-10-18 18:02:47.530918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4f0b6e21c7'
+down_revision: Union[str, None] = '3bdc67ae9bdb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# таблиця -> колонка; на інших БД пошук працює через індекс у пам'яті (search.py)
+TRIGRAM_INDEXES = {
+    'students': 'fullname',
+    'teachers': 'fullname',
+    'subjects': 'name',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, column in TRIGRAM_INDEXES.items():
+        op.create_index(f'ix_{table}_{column}_trgm', table, [column], unique=False,
+                        postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    for table, column in TRIGRAM_INDEXES.items():
+        op.drop_index(f'ix_{table}_{column}_trgm', table_name=table)
@@ -0,0 +1,70 @@
+"""Cascading foreign keys for deletes
+
+Revision ID: a3e6c2d9f417
+Revises: f1c9a4e7b2d8
+Create Date: 2026-10-18 20:31:52.418906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e6c2d9f417'
+down_revision: Union[str, None] = 'f1c9a4e7b2d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (таблиця, колонка, таблиця-ціль, ondelete): оцінки видаляються разом зі студентом чи предметом,
+# студенти й предмети лишаються без групи чи викладача
+FOREIGN_KEYS = (
+    ('grades', 'student_id', 'students', 'CASCADE'),
+    ('grades', 'subject_id', 'subjects', 'CASCADE'),
+    ('students', 'group_id', 'groups', 'SET NULL'),
+    ('subjects', 'teacher_id', 'teachers', 'SET NULL'),
+)
+
+
+def _recreate(ondelete):
+    # Ключі секціонованої grades (c41e7a9d2f53) створюються на батьківській таблиці й переходять на секції
+    for table, column, target, action in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, target, [column], ['id'], ondelete=action if ondelete else None)
+
+
+def _drop_archive_foreign_keys():
+    # Архівні секції, від'єднані раніше (partitions.detach_partitions), зберегли ключі без ON DELETE:
+    # видалення студента з архівними оцінками падало б. Архіви більше не посилаються на живі рядки
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    op.execute("""
+        DO $$
+        DECLARE
+            fk record;
+        BEGIN
+            FOR fk IN
+                SELECT c.conrelid::regclass AS archive, c.conname
+                FROM pg_constraint c JOIN pg_class t ON t.oid = c.conrelid
+                WHERE c.contype = 'f' AND c.confrelid IN ('students'::regclass, 'subjects'::regclass)
+                  AND t.relname LIKE 'grades\\_%' AND t.relkind = 'r'
+                  AND NOT EXISTS (SELECT 1 FROM pg_inherits i WHERE i.inhrelid = c.conrelid)
+            LOOP
+                EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', fk.archive, fk.conname);
+            END LOOP;
+        END $$
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _drop_archive_foreign_keys()
+    _recreate(ondelete=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Ключі архівних секцій не відновлюються: їхні оцінки могли пережити видалених студентів
+    _recreate(ondelete=False)
@@ -0,0 +1,82 @@
+"""Grade rollup tables
+
+Revision ID: b5c5c16a5651
+Revises: f3d623201b27
+Create Date: 2026-10-18 11:02:17.480263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5c5c16a5651'
+down_revision: Union[str, None] = 'f3d623201b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('student_subject_stats',
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('subject_id', sa.Integer(), nullable=False),
+    sa.Column('grade_sum', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('grade_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('student_id', 'subject_id')
+    )
+    op.create_index(op.f('ix_student_subject_stats_subject_id'), 'student_subject_stats', ['subject_id'], unique=False)
+    op.create_table('student_stats',
+    sa.Column('student_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('grade_sum', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('grade_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('student_id')
+    )
+    op.create_table('subject_stats',
+    sa.Column('subject_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('grade_sum', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('grade_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('subject_id')
+    )
+    op.create_table('group_subject_stats',
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('subject_id', sa.Integer(), nullable=False),
+    sa.Column('grade_sum', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('grade_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('group_id', 'subject_id')
+    )
+    op.create_index(op.f('ix_group_subject_stats_subject_id'), 'group_subject_stats', ['subject_id'], unique=False)
+
+    # Заповнення агрегатів з наявних оцінок; далі їх актуальними тримає rollups.py
+    graded = "student_id IS NOT NULL AND subject_id IS NOT NULL"
+    op.execute(
+        "INSERT INTO student_subject_stats (student_id, subject_id, grade_sum, grade_count) "
+        "SELECT student_id, subject_id, sum(CAST(grade AS NUMERIC(14, 2))), count(id) FROM grades "
+        f"WHERE {graded} GROUP BY student_id, subject_id"
+    )
+    op.execute(
+        "INSERT INTO student_stats (student_id, grade_sum, grade_count) "
+        "SELECT student_id, sum(grade_sum), sum(grade_count) FROM student_subject_stats GROUP BY student_id"
+    )
+    op.execute(
+        "INSERT INTO subject_stats (subject_id, grade_sum, grade_count) "
+        "SELECT subject_id, sum(grade_sum), sum(grade_count) FROM student_subject_stats GROUP BY subject_id"
+    )
+    op.execute(
+        "INSERT INTO group_subject_stats (group_id, subject_id, grade_sum, grade_count) "
+        "SELECT s.group_id, st.subject_id, sum(st.grade_sum), sum(st.grade_count) "
+        "FROM student_subject_stats st JOIN students s ON s.id = st.student_id "
+        "WHERE s.group_id IS NOT NULL GROUP BY s.group_id, st.subject_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_group_subject_stats_subject_id'), table_name='group_subject_stats')
+    op.drop_table('group_subject_stats')
+    op.drop_table('subject_stats')
+    op.drop_table('student_stats')
+    op.drop_index(op.f('ix_student_subject_stats_subject_id'), table_name='student_subject_stats')
+    op.drop_table('student_subject_stats')
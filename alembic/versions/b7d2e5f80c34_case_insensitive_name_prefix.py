@@ -0,0 +1,39 @@
+"""Case-insensitive name prefix indexes
+
+Revision ID: b7d2e5f80c34
+Revises: a3e6c2d9f417
+Create Date: 2026-10-18 21:12:07.563214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e5f80c34'
+down_revision: Union[str, None] = 'a3e6c2d9f417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (таблиця, колонка, старий індекс 3bdc67ae9bdb): пошук у TUI порівнює префікс з lower(колонка)
+PREFIX_INDEXES = (
+    ('students', 'fullname', 'ix_students_fullname'),
+    ('teachers', 'fullname', 'ix_teachers_fullname'),
+    ('subjects', 'name', 'ix_subjects_name'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column, old_index in PREFIX_INDEXES:
+        op.drop_index(old_index, table_name=table)
+        op.create_index(f'{old_index}_lower', table, [sa.text(f'lower({column}) text_pattern_ops')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column, old_index in PREFIX_INDEXES:
+        op.drop_index(f'{old_index}_lower', table_name=table)
+        op.create_index(old_index, table, [column], unique=False, postgresql_ops={column: 'text_pattern_ops'})
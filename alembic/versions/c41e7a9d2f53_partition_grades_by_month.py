@@ -0,0 +1,95 @@
+"""Partition grades by month of date_received
+
+Revision ID: c41e7a9d2f53
+Revises: 9d4f0b6e21c7
+Create Date: 2026-10-18 18:34:05.117342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7a9d2f53'
+down_revision: Union[str, None] = '9d4f0b6e21c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Місячні секції від найстарішої оцінки до MONTHS_AHEAD місяців наперед (далі — partitions.ensure_partitions);
+# рядки поза секціями потрапляють у grades_default
+MONTHS_AHEAD = 12
+COLUMNS = 'id, student_id, subject_id, grade, date_received'
+
+
+def _grades_table(name, *constraints, **kw):
+    op.create_table(name,
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('grades_id_seq')"), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=True),
+    sa.Column('subject_id', sa.Integer(), nullable=True),
+    sa.Column('grade', sa.Float(), nullable=False),
+    sa.Column('date_received', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], name=f'{name}_student_id_fkey'),
+    sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], name=f'{name}_subject_id_fkey'),
+    *constraints,
+    **kw
+    )
+
+
+def _replace_grades(new_name):
+    # Дані вже скопійовано в new_name: стара таблиця видаляється, нова отримує її ім'я та імена обмежень.
+    # Послідовність id переживає DROP TABLE, бо спершу відв'язується від старої колонки
+    op.execute("ALTER SEQUENCE grades_id_seq OWNED BY NONE")
+    op.drop_table('grades')
+    op.rename_table(new_name, 'grades')
+    op.execute(f"ALTER TABLE grades RENAME CONSTRAINT {new_name}_pkey TO grades_pkey")
+    op.execute(f"ALTER TABLE grades RENAME CONSTRAINT {new_name}_student_id_fkey TO grades_student_id_fkey")
+    op.execute(f"ALTER TABLE grades RENAME CONSTRAINT {new_name}_subject_id_fkey TO grades_subject_id_fkey")
+    op.execute("ALTER SEQUENCE grades_id_seq OWNED BY grades.id")
+    op.create_unique_constraint(
+        'uq_grades_student_subject_date', 'grades', ['student_id', 'subject_id', 'date_received']
+    )
+    op.create_index(
+        'ix_grades_subject_student', 'grades', ['subject_id', 'student_id'],
+        unique=False, postgresql_include=['grade']
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    # Первинний ключ секціонованої таблиці має містити ключ секціонування
+    _grades_table('grades_partitioned', postgresql_partition_by='RANGE (date_received)')
+    op.create_primary_key('grades_partitioned_pkey', 'grades_partitioned', ['id', 'date_received'])
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month date;
+            last_month date;
+        BEGIN
+            SELECT date_trunc('month', coalesce(min(date_received), current_date))::date,
+                   (date_trunc('month', greatest(max(date_received), current_date))
+                    + interval '{MONTHS_AHEAD} months')::date
+            INTO month, last_month FROM grades;
+            WHILE month <= last_month LOOP
+                EXECUTE format('CREATE TABLE %I PARTITION OF grades_partitioned FOR VALUES FROM (%L) TO (%L)',
+                               'grades_' || to_char(month, 'YYYY_MM'), month, (month + interval '1 month')::date);
+                month := (month + interval '1 month')::date;
+            END LOOP;
+        END $$
+    """)
+    op.execute("CREATE TABLE grades_default PARTITION OF grades_partitioned DEFAULT")
+    op.execute(f"INSERT INTO grades_partitioned ({COLUMNS}) SELECT {COLUMNS} FROM grades")
+    _replace_grades('grades_partitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    # Від'єднані раніше секції (архів) лишаються окремими таблицями й назад не повертаються
+    _grades_table('grades_plain', sa.PrimaryKeyConstraint('id', name='grades_plain_pkey'))
+    op.execute(f"INSERT INTO grades_plain ({COLUMNS}) SELECT {COLUMNS} FROM grades")
+    _replace_grades('grades_plain')
@@ -0,0 +1,43 @@
+"""Denormalized group_id and teacher_id on grades
+
+Revision ID: e8b3d1f05a62
+Revises: c41e7a9d2f53
+Create Date: 2026-10-18 19:12:40.284119
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3d1f05a62'
+down_revision: Union[str, None] = 'c41e7a9d2f53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Копії students.group_id і subjects.teacher_id без зовнішніх ключів (див. models.Grade)
+    op.add_column('grades', sa.Column('group_id', sa.Integer(), nullable=True))
+    op.add_column('grades', sa.Column('teacher_id', sa.Integer(), nullable=True))
+    # Заповнення одним проходом по grades; оцінки без студента чи предмета лишаються з NULL
+    op.execute(
+        "UPDATE grades SET group_id = students.group_id, teacher_id = subjects.teacher_id "
+        "FROM students, subjects "
+        "WHERE students.id = grades.student_id AND subjects.id = grades.subject_id"
+    )
+    op.create_index('ix_grades_subject_group', 'grades', ['subject_id', 'group_id'], unique=False,
+                    postgresql_include=['student_id', 'grade', 'date_received'])
+    op.create_index('ix_grades_teacher', 'grades', ['teacher_id'], unique=False,
+                    postgresql_include=['grade', 'date_received'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_grades_teacher', table_name='grades')
+    op.drop_index('ix_grades_subject_group', table_name='grades')
+    op.drop_column('grades', 'teacher_id')
+    op.drop_column('grades', 'group_id')
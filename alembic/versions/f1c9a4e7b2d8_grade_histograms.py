@@ -0,0 +1,62 @@
+"""Grade histogram rollup tables
+
+Revision ID: f1c9a4e7b2d8
+Revises: e8b3d1f05a62
+Create Date: 2026-10-18 19:48:21.603557
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c9a4e7b2d8'
+down_revision: Union[str, None] = 'e8b3d1f05a62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Ті самі кошики, що й rollups.bucket_of: 80 кошиків по 0.5 бала від 60, крайні значення — у крайні кошики
+BUCKET = (
+    "CASE WHEN grade >= 100 THEN 79 WHEN grade < 60 THEN 0 "
+    "ELSE CAST(floor((grade - 60) / 0.5) AS INTEGER) END"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('subject_grade_buckets',
+    sa.Column('subject_id', sa.Integer(), nullable=False),
+    sa.Column('bucket', sa.SmallInteger(), nullable=False),
+    sa.Column('grade_sum', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('grade_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('subject_id', 'bucket')
+    )
+    op.create_table('group_grade_buckets',
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('bucket', sa.SmallInteger(), nullable=False),
+    sa.Column('grade_sum', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('grade_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('group_id', 'bucket')
+    )
+
+    # Заповнення subject_grade_buckets і group_grade_buckets з наявних оцінок (далі їх оновлює rollups.py);
+    # група береться з денормалізованої grades.group_id (e8b3d1f05a62), без з'єднання зі students
+    graded = "student_id IS NOT NULL AND subject_id IS NOT NULL"
+    op.execute(
+        "INSERT INTO subject_grade_buckets (subject_id, bucket, grade_sum, grade_count) "
+        f"SELECT subject_id, {BUCKET}, sum(CAST(grade AS NUMERIC(14, 2))), count(id) FROM grades "
+        f"WHERE {graded} GROUP BY subject_id, {BUCKET}"
+    )
+    op.execute(
+        "INSERT INTO group_grade_buckets (group_id, bucket, grade_sum, grade_count) "
+        f"SELECT group_id, {BUCKET}, sum(CAST(grade AS NUMERIC(14, 2))), count(id) FROM grades "
+        f"WHERE {graded} AND group_id IS NOT NULL GROUP BY group_id, {BUCKET}"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('group_grade_buckets')
+    op.drop_table('subject_grade_buckets')
@@ -0,0 +1,46 @@
+"""Indexes for report queries and unique grade key
+
+Revision ID: f3d623201b27
+Revises: 7104feb92b21
+Create Date: 2026-10-18 10:12:41.305118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3d623201b27'
+down_revision: Union[str, None] = '7104feb92b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Видалення дублікатів, що лишилися від старих запусків сидування, перед додаванням унікального ключа.
+    # Рядки з NULL у student_id чи subject_id ключ не порушують (NULL не рівні між собою), тож їх не чіпаємо
+    graded = "student_id IS NOT NULL AND subject_id IS NOT NULL"
+    op.execute(
+        f"DELETE FROM grades WHERE {graded} AND id NOT IN ("
+        f"SELECT min(id) FROM grades WHERE {graded} GROUP BY student_id, subject_id, date_received)"
+    )
+    op.create_unique_constraint(
+        'uq_grades_student_subject_date', 'grades', ['student_id', 'subject_id', 'date_received']
+    )
+    op.create_index(
+        'ix_grades_subject_student', 'grades', ['subject_id', 'student_id'],
+        unique=False, postgresql_include=['grade']
+    )
+    op.create_index(op.f('ix_students_group_id'), 'students', ['group_id'], unique=False)
+    op.create_index(op.f('ix_subjects_teacher_id'), 'subjects', ['teacher_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_subjects_teacher_id'), table_name='subjects')
+    op.drop_index(op.f('ix_students_group_id'), table_name='students')
+    op.drop_index('ix_grades_subject_student', table_name='grades')
+    op.drop_constraint('uq_grades_student_subject_date', 'grades', type_='unique')
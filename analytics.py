@@ -0,0 +1,290 @@
+import numpy as np
+from sqlalchemy import select, func, and_
+from models import Student, Subject, Group, Grade
+
+# Аналітика в пам'яті: grades, students і subjects завантажуються один раз у колонкові масиви NumPy,
+# після чого select_1..select_10 (і довільні варіації) рахуються векторно без звернень до БД.
+# На оцінку — 16 байт (int32 student_id/subject_id, float32 grade, int32 день дати), тож
+# 100 млн оцінок займають ~1.5 ГБ. Дата зберігається як номер дня і стає datetime64[D] на виході.
+#
+# Оцінки завантажуються впорядкованими за (student_id, subject_id, date_received) — це порядок
+# унікального індексу, — тож кожна пара студент/предмет є суцільним відрізком масиву,
+# а агрегати по ній рахуються одним np.add.reduceat.
+LOAD_CHUNK = 100000
+# Оцінок в одному блоці побудови відрізків: тимчасові масиви (булеві порівняння, float64 для сум)
+# займають кілька МБ, а не байти на кожну з усіх оцінок поверх 16 резидентних
+PAIR_BLOCK = 1000000
+EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+def _names(conn, query):
+    ids, names = [], []
+    for row_id, name in conn.execute(query):
+        ids.append(row_id)
+        names.append(name)
+    return np.array(ids, dtype=np.int32), np.array(names, dtype=object)
+
+
+def _round(values):
+    return np.round(values, 2)
+
+
+class GradeAnalytics:
+    def __init__(self, grade_student, grade_subject, grade, grade_day,
+                 student_id, student_name, student_group, subject_id, subject_name, subject_teacher,
+                 group_id, group_name):
+        self.grade_student = grade_student
+        self.grade_subject = grade_subject
+        self.grade = grade
+        self.grade_day = grade_day
+        self.student_id, self.student_name, self.student_group = student_id, student_name, student_group
+        self.subject_id, self.subject_name, self.subject_teacher = subject_id, subject_name, subject_teacher
+        self.group_id, self.group_name = group_id, group_name
+        self._build_pairs()
+
+    @classmethod
+    def load(cls, conn, chunk=LOAD_CHUNK):
+        graded = and_(Grade.student_id.isnot(None), Grade.subject_id.isnot(None))
+        total = conn.execute(select(func.count()).select_from(Grade).where(graded)).scalar()
+        grade_student = np.empty(total, dtype=np.int32)
+        grade_subject = np.empty(total, dtype=np.int32)
+        grade = np.empty(total, dtype=np.float32)
+        grade_day = np.empty(total, dtype=np.int32)
+
+        query = (
+            select(Grade.student_id, Grade.subject_id, Grade.grade, Grade.date_received)
+            .where(graded)
+            .order_by(Grade.student_id, Grade.subject_id, Grade.date_received)
+            .execution_options(yield_per=chunk)
+        )
+        offset = 0
+        for rows in conn.execute(query).partitions():
+            end = offset + len(rows)
+            student_ids, subject_ids, grades, dates = zip(*rows)
+            grade_student[offset:end] = student_ids
+            grade_subject[offset:end] = subject_ids
+            grade[offset:end] = grades
+            grade_day[offset:end] = (np.array(dates, dtype='datetime64[D]') - EPOCH).astype(np.int32)
+            offset = end
+
+        student_id, student_name = _names(conn, select(Student.id, Student.fullname).order_by(Student.id))
+        student_group = np.array(
+            conn.execute(select(func.coalesce(Student.group_id, -1)).order_by(Student.id)).scalars().all(),
+            dtype=np.int32,
+        )
+        subject_id, subject_name = _names(conn, select(Subject.id, Subject.name).order_by(Subject.id))
+        subject_teacher = np.array(
+            conn.execute(select(func.coalesce(Subject.teacher_id, -1)).order_by(Subject.id)).scalars().all(),
+            dtype=np.int32,
+        )
+        group_id, group_name = _names(conn, select(Group.id, Group.name).order_by(Group.id))
+        return cls(grade_student[:offset], grade_subject[:offset], grade[:offset], grade_day[:offset],
+                   student_id, student_name, student_group, subject_id, subject_name, subject_teacher,
+                   group_id, group_name)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        # Колонки оцінок — memmap-масиви знімка (snapshot.py), у пам'ять не копіюються
+        column = snapshot.column
+        return cls(column('grades', 'student_id'), column('grades', 'subject_id'), column('grades', 'grade'),
+                   column('grades', 'date_received'),
+                   column('students', 'id'), column('students', 'fullname'), column('students', 'group_id'),
+                   column('subjects', 'id'), column('subjects', 'name'), column('subjects', 'teacher_id'),
+                   column('groups', 'id'), column('groups', 'name'))
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.grade_student, self.grade_subject, self.grade, self.grade_day))
+
+    # --- Агрегати по відрізках ---
+
+    def _build_pairs(self):
+        # Межі відрізків (студент, предмет) у впорядкованих оцінках
+        n = len(self.grade)
+        parts = [np.zeros(1 if n else 0, dtype=np.int64)]
+        for lo in range(0, n - 1, PAIR_BLOCK):
+            hi = min(lo + PAIR_BLOCK, n - 1)
+            changed = self.grade_student[lo + 1:hi + 1] != self.grade_student[lo:hi]
+            changed |= self.grade_subject[lo + 1:hi + 1] != self.grade_subject[lo:hi]
+            parts.append(np.flatnonzero(changed) + (lo + 1))
+        starts = np.concatenate(parts)
+        self.pair_start = starts
+        self.pair_count = np.diff(np.append(starts, n))
+        self.pair_student = self.grade_student[starts]
+        self.pair_subject = self.grade_subject[starts]
+        self.pair_sum = self._pair_sums(starts)
+        # Щільні індекси студентів і предметів для bincount
+        self.pair_student_idx = np.searchsorted(self.student_id, self.pair_student)
+        self.pair_subject_idx = np.searchsorted(self.subject_id, self.pair_subject)
+
+    def _pair_sums(self, starts):
+        # Суми відрізків у float64 з float32-колонки. reduceat з dtype=float64 приводить увесь вхід
+        # (8 байт на оцінку), тож колонка обробляється блоками по PAIR_BLOCK оцінок за межами відрізків
+        sums = np.empty(len(starts))
+        i = 0
+        while i < len(starts):
+            j = max(int(np.searchsorted(starts, starts[i] + PAIR_BLOCK)), i + 1)
+            end = starts[j] if j < len(starts) else len(self.grade)
+            sums[i:j] = np.add.reduceat(self.grade[starts[i]:end], starts[i:j] - starts[i], dtype=np.float64)
+            i = j
+        return sums
+
+    def _index(self, ids, value):
+        idx = np.searchsorted(ids, value)
+        return idx if idx < len(ids) and ids[idx] == value else None
+
+    def student_averages(self):
+        # Сума, кількість і середнє для кожного студента (у порядку self.student_id)
+        n = len(self.student_id)
+        sums = np.bincount(self.pair_student_idx, weights=self.pair_sum, minlength=n)
+        counts = np.bincount(self.pair_student_idx, weights=self.pair_count, minlength=n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return sums, counts, sums / counts
+
+    def subject_totals(self):
+        n = len(self.subject_id)
+        sums = np.bincount(self.pair_subject_idx, weights=self.pair_sum, minlength=n)
+        counts = np.bincount(self.pair_subject_idx, weights=self.pair_count, minlength=n)
+        return sums, counts
+
+    def _top(self, students, averages, k):
+        # argpartition відбирає k найкращих за O(n), сортуються лише вони
+        if len(averages) > k:
+            part = np.argpartition(-averages, k - 1)[:k]
+        else:
+            part = np.arange(len(averages))
+        order = part[np.argsort(-averages[part], kind='stable')]
+        return [(self.student_name[students[i]], float(_round(averages[i]))) for i in order]
+
+    # --- Ті самі звіти, що й у my_select ---
+
+    def top_students(self, k=5, subject_id=None):
+        if k <= 0:
+            return []
+        if subject_id is None:
+            _, counts, averages = self.student_averages()
+            students = np.flatnonzero(counts > 0)
+            return self._top(students, averages[students], k)
+        mask = self.pair_subject == subject_id
+        return self._top(self.pair_student_idx[mask], self.pair_sum[mask] / self.pair_count[mask], k)
+
+    def select_1(self, k=5):
+        return self.top_students(k)
+
+    def select_2(self, subject_id):
+        result = self.top_students(1, subject_id)
+        return result[0] if result else None
+
+    def select_3(self, subject_id):
+        mask = self.pair_subject == subject_id
+        groups = self.student_group[self.pair_student_idx[mask]]
+        known = groups >= 0
+        group_idx = np.searchsorted(self.group_id, groups[known])
+        sums = np.bincount(group_idx, weights=self.pair_sum[mask][known], minlength=len(self.group_id))
+        counts = np.bincount(group_idx, weights=self.pair_count[mask][known], minlength=len(self.group_id))
+        present = np.flatnonzero(counts > 0)
+        return [(self.group_name[i], float(_round(sums[i] / counts[i]))) for i in present]
+
+    def select_4(self):
+        if not len(self.grade):
+            return None
+        return float(_round(self.pair_sum.sum() / len(self.grade)))
+
+    def select_5(self, teacher_id):
+        return [(name,) for name in self.subject_name[self.subject_teacher == teacher_id]]
+
+    def select_6(self, group_id):
+        return [(name,) for name in self.student_name[self.student_group == group_id]]
+
+    def select_7(self, group_id, subject_id):
+        mask = (self.pair_subject == subject_id) & (self.student_group[self.pair_student_idx] == group_id)
+        result = []
+        for start, count, student in zip(self.pair_start[mask], self.pair_count[mask], self.pair_student_idx[mask]):
+            name = self.student_name[student]
+            result.extend((name, grade) for grade in _round(self.grade[start:start + count].astype(np.float64)).tolist())
+        return result
+
+    def select_8(self, teacher_id):
+        sums, counts = self.subject_totals()
+        mask = self.subject_teacher == teacher_id
+        count = counts[mask].sum()
+        return float(_round(sums[mask].sum() / count)) if count else None
+
+    def _student_slice(self, student_id):
+        return (np.searchsorted(self.grade_student, student_id, 'left'),
+                np.searchsorted(self.grade_student, student_id, 'right'))
+
+    def select_9(self, student_id):
+        start, end = self._student_slice(student_id)
+        subjects = np.unique(self.grade_subject[start:end])
+        known = [self._index(self.subject_id, s) for s in subjects]
+        return [(self.subject_name[i],) for i in known if i is not None]
+
+    def select_10(self, student_id, subject_id):
+        start, end = self._student_slice(student_id)
+        subjects = self.grade_subject[start:end]
+        lo = start + np.searchsorted(subjects, subject_id, 'left')
+        hi = start + np.searchsorted(subjects, subject_id, 'right')
+        grades = _round(self.grade[lo:hi].astype(np.float64)).tolist()
+        dates = (EPOCH + self.grade_day[lo:hi]).tolist()
+        return list(zip(grades, dates))
+
+
+def load(conn, chunk=LOAD_CHUNK):
+    return GradeAnalytics.load(conn, chunk)
+
+
+# --- Перевірка паритету з SQL-версією ---
+
+def _normalize(value):
+    # Row/Decimal/float -> кортежі з float, округленими до сотих
+    if isinstance(value, (list, tuple)) or hasattr(value, '_mapping'):
+        return tuple(_normalize(item) for item in value)
+    if value is None or isinstance(value, str):
+        return value
+    if hasattr(value, 'isoformat'):
+        return value
+    return round(float(value), 2)
+
+
+def _same(name, expected, actual):
+    expected, actual = _normalize(expected), _normalize(actual)
+    if name in ('select_1', 'select_2'):
+        # При однакових середніх порядок студентів може відрізнятися — порівнюються самі середні
+        expected = tuple(row[-1] for row in expected) if name == 'select_1' else (expected and expected[-1])
+        actual = tuple(row[-1] for row in actual) if name == 'select_1' else (actual and actual[-1])
+    elif name not in ('select_4', 'select_8', 'select_10'):
+        # Запити без ORDER BY
+        expected, actual = tuple(sorted(expected)), tuple(sorted(actual))
+    return _close(expected, actual)
+
+
+def _close(a, b):
+    if isinstance(a, tuple) and isinstance(b, tuple):
+        return len(a) == len(b) and all(_close(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) and isinstance(b, float):
+        return abs(a - b) <= 0.011
+    return a == b
+
+
+def check(data, queries, limit=20):
+    # Порівнює кожен select_N з відповідною функцією queries (my_select) на перших limit id;
+    # повертає список розбіжностей (ім'я, аргументи, SQL, NumPy)
+    subjects = data.subject_id[:limit].tolist()
+    groups = data.group_id[:limit].tolist()
+    teachers = sorted(set(data.subject_teacher.tolist()) - {-1})[:limit]
+    students = data.student_id[:limit].tolist()
+    cases = [('select_1', ()), ('select_1', (limit,)), ('select_4', ())]
+    cases += [(name, (s,)) for s in subjects for name in ('select_2', 'select_3')]
+    cases += [(name, (t,)) for t in teachers for name in ('select_5', 'select_8')]
+    cases += [('select_6', (g,)) for g in groups]
+    cases += [('select_7', (g, s)) for g in groups for s in subjects]
+    cases += [('select_9', (st,)) for st in students]
+    cases += [('select_10', (st, s)) for st in students for s in subjects]
+    mismatches = []
+    for name, args in cases:
+        expected = getattr(queries, name)(*args)
+        actual = getattr(data, name)(*args)
+        if not _same(name, expected, actual):
+            mismatches.append((name, args, expected, actual))
+    return mismatches
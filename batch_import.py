@@ -0,0 +1,244 @@
+import os
+import csv
+import json
+import time
+from sqlalchemy import select, update, insert, delete, bindparam
+from sqlalchemy.exc import SQLAlchemyError
+from models import Group, Teacher, Subject, Student
+from bulk_seed import chunked, sync_sequence
+from rollups import UPSERT_INSERTS, move_student, move_subject, prepare_delete
+import cache
+
+# Пакетні CRUD-зміни з файлу (JSONL або CSV), по запису на рядок:
+#   {"model": "Student", "op": "upsert", "id": 12, "fullname": "Ann Lee", "group_id": 3}
+#   {"model": "Group", "op": "delete", "id": 7}
+# op: upsert (за замовчуванням) або delete; без id — вставка нового об'єкта.
+# model можна не вказувати, якщо задано модель за замовчуванням (-m). Для Student/Teacher
+# поле name приймається як fullname. Записи застосовуються чанками, кожен чанк — окрема транзакція;
+# невалідний рядок або рядок, що порушує обмеження БД, пропускається й потрапляє у звіт.
+MODELS = {'Group': Group, 'Teacher': Teacher, 'Subject': Subject, 'Student': Student}
+# Поля, які можна змінювати, крім id
+FIELDS = {
+    Group: {'name': str},
+    Teacher: {'fullname': str},
+    Subject: {'name': str, 'teacher_id': int},
+    Student: {'fullname': str, 'group_id': int},
+}
+# У межах чанка довідники оновлюються перед залежними таблицями, видалення — у зворотному порядку
+UPSERT_ORDER = (Group, Teacher, Subject, Student)
+DELETE_ORDER = UPSERT_ORDER[::-1]
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 20
+
+
+class RecordError(ValueError):
+    pass
+
+
+def iter_records(path):
+    # (номер рядка, словник) з JSONL або CSV; формат визначається за розширенням
+    with open(path, encoding='utf-8', newline='') as f:
+        if os.path.splitext(path)[1].lower() == '.csv':
+            for line_no, row in enumerate(csv.DictReader(f), start=2):
+                yield line_no, {key: value for key, value in row.items() if key and value not in ('', None)}
+            return
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, RecordError(f"некоректний JSON: {e.msg}")
+                continue
+            yield line_no, record if isinstance(record, dict) else RecordError("запис має бути об'єктом")
+
+
+def parse_record(record, default_model=None):
+    # Запис -> (модель, op, значення полів) або RecordError
+    if isinstance(record, RecordError):
+        raise record
+    model = MODELS.get(record.get('model') or default_model)
+    if model is None:
+        raise RecordError(f"невідома модель: {record.get('model') or default_model!r}")
+    op = record.get('op', 'upsert')
+    if op not in ('upsert', 'delete'):
+        raise RecordError(f"невідома операція: {op!r}")
+    values = {}
+    if record.get('id') is not None:
+        values['id'] = _coerce(record['id'], int, 'id')
+    if op == 'delete':
+        if 'id' not in values:
+            raise RecordError("для delete потрібен id")
+        return model, op, values
+    fields = FIELDS[model]
+    for key, value in record.items():
+        if key in ('model', 'op', 'id'):
+            continue
+        if key == 'name' and 'fullname' in fields:
+            key = 'fullname'
+        if key not in fields:
+            raise RecordError(f"невідоме поле {key!r} для {model.__name__}")
+        values[key] = None if value is None else _coerce(value, fields[key], key)
+    if len(values) == ('id' in values):
+        raise RecordError("немає полів для зміни")
+    return model, op, values
+
+
+def _coerce(value, kind, field):
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        raise RecordError(f"поле {field}: очікується {kind.__name__}, отримано {value!r}")
+
+
+# --- Застосування ---
+
+def _upsert(conn, model, rows):
+    table = model.__table__
+    # Кілька записів з одним id у чанку зливаються в один (останнє значення поля виграє):
+    # ON CONFLICT не може змінити той самий рядок двічі в одному INSERT
+    merged = {}
+    for row in rows:
+        if 'id' in row:
+            merged.setdefault(row['id'], {}).update(row)
+    rows = [row for row in rows if 'id' not in row] + list(merged.values())
+    # Переходи студентів між групами та предметів між викладачами оновлюють агрегати
+    # і grades.group_id/teacher_id так само, як зміни через сесію
+    moved = _owner_changes(conn, model, 'group_id', rows) if model is Student else []
+    reassigned = _owner_changes(conn, model, 'teacher_id', rows) if model is Subject else []
+    # executemany вимагає однакового набору колонок у всіх рядках
+    by_columns = {}
+    for row in rows:
+        by_columns.setdefault(tuple(sorted(row)), []).append(row)
+    required = {column.name for column in table.columns if not column.nullable and not column.primary_key}
+    for columns, group in by_columns.items():
+        if 'id' not in columns:
+            continue
+        if required <= set(columns):
+            _upsert_by_id(conn, table, columns, group)
+        else:
+            # Неповний запис — лише зміна наявного об'єкта
+            _update_by_id(conn, model, columns, group)
+    # Нові об'єкти без id — після рядків з явними id і підтягування послідовності
+    sync_sequence(conn, table)
+    for columns, group in by_columns.items():
+        if 'id' not in columns:
+            conn.execute(insert(table), group)
+    for student_id, old_group_id, new_group_id in moved:
+        move_student(conn, student_id, old_group_id, new_group_id)
+    for subject_id, _, teacher_id in reassigned:
+        move_subject(conn, subject_id, teacher_id)
+
+
+def _owner_changes(conn, model, field, rows):
+    # [(id, старе значення, нове)] для наявних об'єктів, у яких змінюється field
+    changing = {row['id']: row[field] for row in rows if 'id' in row and field in row}
+    if not changing:
+        return []
+    column = getattr(model, field)
+    return [(obj_id, old, changing[obj_id])
+            for obj_id, old in conn.execute(select(model.id, column).where(model.id.in_(changing)))
+            if old != changing[obj_id]]
+
+
+def _upsert_by_id(conn, table, columns, rows):
+    factory = UPSERT_INSERTS.get(conn.dialect.name)
+    if factory is None:
+        for row in rows:
+            values = {key: value for key, value in row.items() if key != 'id'}
+            if not conn.execute(update(table).where(table.c.id == row['id']).values(values)).rowcount:
+                conn.execute(insert(table).values(row))
+        return
+    stmt = factory(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['id'], set_={column: stmt.excluded[column] for column in columns if column != 'id'}
+    )
+    conn.execute(stmt, rows)
+
+
+def _update_by_id(conn, model, columns, rows):
+    table = model.__table__
+    ids = [row['id'] for row in rows]
+    found = set(conn.execute(select(model.id).where(model.id.in_(ids))).scalars())
+    missing = [row_id for row_id in ids if row_id not in found]
+    if missing:
+        raise RecordError(f"{model.__name__} id={missing[0]} не знайдено; для створення потрібні всі обов'язкові поля")
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam('b_id'))
+        .values({column: bindparam(column) for column in columns if column != 'id'})
+    )
+    conn.execute(stmt, [dict({key: value for key, value in row.items() if key != 'id'}, b_id=row['id'])
+                        for row in rows])
+
+
+def _delete(conn, model, rows):
+    # Оцінки й посилання на видалені рядки обробляє БД (ON DELETE), агрегати — prepare_delete
+    ids = [row['id'] for row in rows]
+    prepare_delete(conn, model, ids)
+    conn.execute(delete(model.__table__).where(model.id.in_(ids)))
+
+
+def _apply(conn, parsed):
+    # parsed: [(номер рядка, модель, op, значення)] одного чанка
+    for op, order in (('upsert', UPSERT_ORDER), ('delete', DELETE_ORDER)):
+        for model in order:
+            rows = [values for _, m, o, values in parsed if m is model and o == op]
+            if rows:
+                (_upsert if op == 'upsert' else _delete)(conn, model, rows)
+
+
+def import_records(engine, records, default_model=None, chunk_size=CHUNK_SIZE, progress=print):
+    # records: ітератор (номер рядка, запис). Повертає статистику та перелік помилок
+    stats = {'processed': 0, 'applied': 0, 'failed': 0, 'errors': []}
+    touched = set()
+    started = time.perf_counter()
+
+    def fail(line_no, message):
+        stats['failed'] += 1
+        if len(stats['errors']) < MAX_REPORTED_ERRORS:
+            stats['errors'].append((line_no, message))
+
+    for chunk in chunked(records, chunk_size):
+        parsed = []
+        for line_no, record in chunk:
+            try:
+                parsed.append((line_no, *parse_record(record, default_model)))
+            except RecordError as e:
+                fail(line_no, str(e))
+        stats['processed'] += len(chunk)
+        with engine.connect() as conn:
+            try:
+                _apply(conn, parsed)
+                conn.commit()
+                stats['applied'] += len(parsed)
+            except (SQLAlchemyError, RecordError):
+                # Хоча б один рядок порушив обмеження БД: чанк повторюється по рядку, кожен у savepoint
+                conn.rollback()
+                for item in parsed:
+                    savepoint = conn.begin_nested()
+                    try:
+                        _apply(conn, [item])
+                        savepoint.commit()
+                        stats['applied'] += 1
+                    except (SQLAlchemyError, RecordError) as e:
+                        savepoint.rollback()
+                        fail(item[0], str(getattr(e, 'orig', e)).splitlines()[0])
+                conn.commit()
+            touched.update(model.__tablename__ for _, model, _, _ in parsed)
+            touched.update(*(cache.cascade_tables(model.__table__) for _, model, op, _ in parsed if op == 'delete'))
+        elapsed = time.perf_counter() - started
+        if progress:
+            rate = stats['processed'] / elapsed if elapsed > 0 else float('inf')
+            progress(f"  оброблено {stats['processed']}: застосовано {stats['applied']}, "
+                     f"помилок {stats['failed']} ({rate:.0f} записів/с)")
+    # Core-запити в обхід сесії: кеш звітів і індекс пошуку скидаються явно
+    if touched:
+        cache.invalidate(touched)
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+
+def import_file(engine, path, default_model=None, chunk_size=CHUNK_SIZE, progress=print):
+    return import_records(engine, iter_records(path), default_model, chunk_size, progress)
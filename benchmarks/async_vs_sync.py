@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Вимірюються самі запити, тому кеш результатів вимкнено
+os.environ['DB_CACHE_TTL'] = '0'
+import my_select
+import my_select_async
+from db import engine
+from explain_indexes import sample_args
+
+# Запитів за секунду для синхронного (потоки) і асинхронного шляху за N одночасних клієнтів:
+#   python benchmarks/async_vs_sync.py --concurrency 1 8 32 --requests 50
+
+
+def run_sync(cases, concurrency, requests):
+    def caller(offset):
+        for i in range(requests):
+            name, args = cases[(offset + i) % len(cases)]
+            getattr(my_select, name)(*args)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(caller, range(concurrency)))
+    return concurrency * requests / (time.perf_counter() - t0)
+
+
+async def run_async(cases, concurrency, requests):
+    async def caller(offset):
+        for i in range(requests):
+            name, args = cases[(offset + i) % len(cases)]
+            await getattr(my_select_async, name)(*args)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(caller(offset) for offset in range(concurrency)))
+    return concurrency * requests / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Порівняння sync і async select-запитів")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32], help="Кількість одночасних клієнтів")
+    parser.add_argument('--requests', type=int, default=50, help="Запитів на одного клієнта")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        cases = sample_args(conn)
+    sync_rps = [run_sync(cases, concurrency, args.requests) for concurrency in args.concurrency]
+
+    # Усі асинхронні прогони в одному циклі подій: з'єднання пулу прив'язані до циклу
+    async def run_all():
+        try:
+            return [await run_async(cases, concurrency, args.requests) for concurrency in args.concurrency]
+        finally:
+            await my_select_async.dispose()
+
+    async_rps = asyncio.run(run_all())
+    print(f"{'клієнтів':>9} {'sync, зап/с':>12} {'async, зап/с':>13}")
+    for concurrency, sync_value, async_value in zip(args.concurrency, sync_rps, async_rps):
+        print(f"{concurrency:>9} {sync_value:>12.0f} {async_value:>13.0f}")
+
+
+if __name__ == '__main__':
+    main()
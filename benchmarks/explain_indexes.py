@@ -0,0 +1,125 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from datetime import date
+from sqlalchemy import event, select, func
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Вимірюються самі запити, тому кеш результатів вимкнено
+os.environ['DB_CACHE_TTL'] = '0'
+os.environ['DB_DENORMALIZED_GRADES'] = '0'
+import my_select
+from db import engine
+from models import Student, Subject, Group, Teacher, Grade
+
+# Плани EXPLAIN і затримки select_1..select_10 для поточної схеми.
+# Порівняння "до/після" індексів:
+#   alembic downgrade 7104feb92b21 && python benchmarks/explain_indexes.py --json before.json
+#   alembic upgrade head && python benchmarks/explain_indexes.py --json after.json --compare before.json
+# До b5c5c16a5651 таблиць агрегатів немає, тож select_1-4, 7 і 8 викликаються з періодом на всі дати:
+# з since/until вони читають саму grades, і обидва запуски виконують однакові запити. Денормалізований
+# режим вимкнено: колонок grades.group_id/teacher_id до e8b3d1f05a62 теж немає
+ALL_DATES = {'since': date.min, 'until': date.max}
+
+
+def sample_args(conn):
+    subject_id = conn.execute(select(func.min(Subject.id))).scalar()
+    group_id = conn.execute(select(func.min(Group.id))).scalar()
+    teacher_id = conn.execute(select(func.min(Teacher.id))).scalar()
+    student_id = conn.execute(select(func.min(Student.id))).scalar()
+    return [
+        ('select_1', (), ALL_DATES),
+        ('select_2', (subject_id,), ALL_DATES),
+        ('select_3', (subject_id,), ALL_DATES),
+        ('select_4', (), ALL_DATES),
+        ('select_5', (teacher_id,), {}),
+        ('select_6', (group_id,), {}),
+        ('select_7', (group_id, subject_id), ALL_DATES),
+        ('select_8', (teacher_id,), ALL_DATES),
+        ('select_9', (student_id,), {}),
+        ('select_10', (student_id, subject_id), {}),
+    ]
+
+
+def capture_statement(engine, fn, args, kwargs):
+    # Запит, який функція реально надсилає в БД, разом із параметрами драйвера
+    captured = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', listener)
+    try:
+        fn(*args, **kwargs)
+    finally:
+        event.remove(engine, 'before_cursor_execute', listener)
+    return captured[-1]
+
+
+def explain(conn, statement, parameters):
+    if conn.dialect.name == 'postgresql':
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS) '
+    else:
+        prefix = 'EXPLAIN QUERY PLAN '
+    rows = conn.exec_driver_sql(prefix + statement, parameters).all()
+    return [' '.join(str(value) for value in row) for row in rows]
+
+
+def measure(fn, args, kwargs, repeat):
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args, **kwargs)
+        timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+    return {
+        'p50_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN і затримки select-запитів")
+    parser.add_argument('--repeat', type=int, default=20, help="Кількість запусків кожного запиту")
+    parser.add_argument('--json', help="Зберегти результати у файл")
+    parser.add_argument('--compare', help="Файл попереднього запуску для порівняння")
+    parser.add_argument('--quiet', action='store_true', help="Не друкувати плани")
+    args = parser.parse_args()
+
+    results = {}
+    with engine.connect() as conn:
+        n_grades = conn.execute(select(func.count(Grade.id))).scalar()
+        cases = sample_args(conn)
+        print(f"{engine.dialect.name}, оцінок: {n_grades}")
+        for name, fn_args, fn_kwargs in cases:
+            fn = getattr(my_select, name)
+            statement, parameters = capture_statement(engine, fn, fn_args, fn_kwargs)
+            plan = explain(conn, statement, parameters)
+            results[name] = dict(measure(fn, fn_args, fn_kwargs, args.repeat), plan=plan)
+            if not args.quiet:
+                print(f"\n--- {name}{fn_args} ---")
+                print('\n'.join(plan))
+
+    previous = {}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)['results']
+    print(f"\n{'запит':<10} {'p50, мс':>10} {'p95, мс':>10}" + (f" {'було p50':>10} {'прискор.':>9}" if previous else ''))
+    for name, row in results.items():
+        line = f"{name:<10} {row['p50_ms']:>10.3f} {row['p95_ms']:>10.3f}"
+        if name in previous:
+            before = previous[name]['p50_ms']
+            line += f" {before:>10.3f} {before / row['p50_ms']:>8.1f}x"
+        print(line)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'dialect': engine.dialect.name, 'grades': n_grades, 'results': results}, f,
+                      ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
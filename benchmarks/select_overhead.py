@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Вимірюються самі запити, тому кеш результатів вимкнено
+os.environ['DB_CACHE_TTL'] = '0'
+import my_select
+from db import engine, session_scope
+from models import Student, Subject, Grade
+from explain_indexes import sample_args
+
+# Накладні витрати Python на один виклик: попередня ORM-версія (session.query + гідратація)
+# проти поточних Core-запитів з кешем компіляції. Найпомітніше на коротких запитах:
+#   python benchmarks/select_overhead.py --calls 2000
+
+
+def orm_select_5(teacher_id):
+    with session_scope() as session:
+        return session.query(Subject.name).filter(Subject.teacher_id == teacher_id).all()
+
+
+def orm_select_6(group_id):
+    with session_scope() as session:
+        return session.query(Student.fullname).filter(Student.group_id == group_id).all()
+
+
+def orm_select_9(student_id):
+    with session_scope() as session:
+        return (
+            session.query(Subject.name)
+            .join(Grade, Grade.subject_id == Subject.id)
+            .filter(Grade.student_id == student_id)
+            .distinct()
+            .all()
+        )
+
+
+def orm_select_10(student_id, subject_id):
+    with session_scope() as session:
+        return (
+            session.query(Grade.grade, Grade.date_received)
+            .filter(Grade.student_id == student_id, Grade.subject_id == subject_id)
+            .order_by(Grade.date_received)
+            .all()
+        )
+
+
+ORM_VERSIONS = {
+    'select_5': orm_select_5,
+    'select_6': orm_select_6,
+    'select_9': orm_select_9,
+    'select_10': orm_select_10,
+}
+
+
+def per_call_us(fn, args, calls):
+    fn(*args)
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        fn(*args)
+    return (time.perf_counter() - t0) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Накладні витрати ORM і Core на виклик select-запиту")
+    parser.add_argument('--calls', type=int, default=2000, help="Кількість викликів кожного запиту")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        cases = dict(sample_args(conn))
+    print(f"{'запит':<10} {'ORM, мкс':>10} {'Core, мкс':>10} {'різниця':>9}")
+    for name, orm_fn in ORM_VERSIONS.items():
+        fn_args = cases[name]
+        orm_us = per_call_us(orm_fn, fn_args, args.calls)
+        core_us = per_call_us(getattr(my_select, name), fn_args, args.calls)
+        print(f"{name:<10} {orm_us:>10.1f} {core_us:>10.1f} {orm_us / core_us:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Холодний старт кожної CLI-дії: сумарний час імпортів за python -X importtime і загальний час процесу.
+# Також перевіряє, що дія не тягне модулі, які їй не потрібні. Регресія — ненульовий код виходу:
+#   python benchmarks/startup_time.py --json startup.json
+#   python benchmarks/startup_time.py --compare startup.json --tolerance 1.25
+
+ACTIONS = {
+    'help': ['-a', 'list', '--help'],
+    'list': ['-a', 'list', '-m', 'Group'],
+    'search': ['-a', 'search', '-m', 'Subject', '-n', 'Math'],
+    'rollup-check': ['-a', 'rollup-check'],
+}
+# Модулі, які жодна з цих дій не повинна імпортувати
+FORBIDDEN = {'faker', 'tui', 'analytics', 'snapshot', 'batch_import', 'my_select_async'}
+# search використовує NumPy для індексу триграм у пам'яті
+ALLOWED = {'search': {'numpy'}}
+
+
+def parse_importtime(stderr):
+    # Рядки "import time: self | cumulative | name"; верхній рівень — з одним пробілом перед іменем
+    modules, total_us = set(), 0
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.add(name.strip())
+        if not name[1:].startswith(' '):
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def run_action(args):
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', 'seed.py', *args], cwd=ROOT,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall_ms = (time.perf_counter() - t0) * 1000
+    import_ms, modules = parse_importtime(proc.stderr)
+    return wall_ms, import_ms, modules, proc.returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Час холодного старту CLI-дій seed.py")
+    parser.add_argument('--repeat', type=int, default=5, help="Запусків кожної дії")
+    parser.add_argument('--json', help="Зберегти результати у файл")
+    parser.add_argument('--compare', help="Файл попереднього запуску для порівняння")
+    parser.add_argument('--tolerance', type=float, default=1.25, help="Допустиме сповільнення імпортів, разів")
+    args = parser.parse_args()
+
+    previous = {}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)['results']
+
+    results, failures = {}, []
+    print(f"{'дія':<14} {'імпорти, мс':>12} {'процес, мс':>11}" + (f" {'було, мс':>9}" if previous else ''))
+    for name, action_args in ACTIONS.items():
+        runs = [run_action(action_args) for _ in range(args.repeat)]
+        failed = [code for *_, code in runs if code]
+        modules = set().union(*(run[2] for run in runs))
+        unexpected = sorted(m for m in modules if m.split('.')[0] in FORBIDDEN - ALLOWED.get(name, set()))
+        row = {
+            'import_ms': round(statistics.median(run[1] for run in runs), 1),
+            'wall_ms': round(statistics.median(run[0] for run in runs), 1),
+            'modules': len(modules),
+        }
+        results[name] = row
+        line = f"{name:<14} {row['import_ms']:>12.1f} {row['wall_ms']:>11.1f}"
+        if name in previous:
+            before = previous[name]['import_ms']
+            line += f" {before:>9.1f}"
+            if row['import_ms'] > before * args.tolerance:
+                failures.append(f"{name}: імпорти {row['import_ms']} мс проти {before} мс")
+        print(line)
+        if failed:
+            failures.append(f"{name}: код виходу {failed[0]}")
+        if unexpected:
+            failures.append(f"{name}: зайві модулі {', '.join(unexpected)}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'results': results}, f, ensure_ascii=False, indent=2)
+    for failure in failures:
+        print(f"РЕГРЕСІЯ {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
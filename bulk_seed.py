@@ -0,0 +1,355 @@
+import io
+import csv
+import time
+import random
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor
+from collections import defaultdict
+from datetime import date, timedelta
+from sqlalchemy import create_engine, select, insert, delete, func, text
+from sqlalchemy.pool import NullPool
+from models import Base, Group, Student, Teacher, Subject, Grade
+from rollups import (
+    ROLLUP_KEYS, STUDENT_ROLLUPS, new_rollups, grade_deltas, group_ids, rollup_deltas, merge_rollups, upsert_rollups,
+    apply_deltas,
+)
+
+SUBJECT_NAMES = ['Math', 'Physics', 'History', 'Chemistry', 'Biology', 'Literature', 'English', 'PE', 'Art', 'Music', 'Geography', 'IT']
+BATCH_SIZE = 10000
+# Студентів в одному блоці паралельного сидування; кожен блок має власний детермінований RNG
+PARTITION_SIZE = 1000
+# Базові розміри; за замовчуванням множаться на SCALE (у півтора рази більше даних)
+BASE_SIZES = {'groups': 3, 'teachers': 5, 'subjects': 8, 'students': 50, 'grades': 20}
+SCALE = 1.5
+# Дати оцінок відлічуються від дня-якоря (до року назад). З явним seed без явного якоря це фіксована дата,
+# щоб той самий seed давав ті самі дані будь-якого дня
+SEED_EPOCH = date(2025, 1, 1)
+# Порядок очищення в режимі overwrite: спершу таблиці, що посилаються на інші
+RESET_ORDER = (Grade, Student, Subject, Teacher, Group)
+
+
+def scaled_sizes(scale=SCALE, **overrides):
+    # Розміри з урахуванням масштабу; явно задані значення мають пріоритет
+    sizes = {key: int(value * scale) for key, value in BASE_SIZES.items()}
+    sizes.update({key: value for key, value in overrides.items() if value is not None})
+    return sizes
+
+
+def group_name(i):
+    # A-1 ... Z-1, далі A-2 ... (перші 26 збігаються зі старим сидуванням)
+    return f"{chr(65 + i % 26)}-{i // 26 + 1}"
+
+
+def subject_name(i):
+    base = SUBJECT_NAMES[i % len(SUBJECT_NAMES)]
+    return base if i < len(SUBJECT_NAMES) else f"{base} {i // len(SUBJECT_NAMES) + 1}"
+
+
+def chunked(rows, size):
+    # Розбиває будь-який ітератор на списки фіксованого розміру
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _use_copy(conn):
+    return conn.dialect.name == 'postgresql' and conn.dialect.driver == 'psycopg2'
+
+
+def _copy_rows(conn, table, rows):
+    # COPY ... FROM STDIN у тій самій транзакції, що й з'єднання SQLAlchemy
+    columns = list(rows[0].keys())
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow([row[c] for c in columns])
+    buf.seek(0)
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+    finally:
+        cursor.close()
+
+
+def insert_rows(conn, table, rows, batch_size=BATCH_SIZE, on_chunk=None):
+    # Пакетна вставка з потоку рядків: у пам'яті тримається лише один чанк.
+    # COPY для PostgreSQL/psycopg2, інакше executemany
+    n_rows = 0
+    for chunk in chunked(rows, batch_size):
+        if _use_copy(conn):
+            _copy_rows(conn, table, chunk)
+        else:
+            conn.execute(insert(table), chunk)
+        if on_chunk:
+            on_chunk(chunk)
+        n_rows += len(chunk)
+    return n_rows
+
+
+def sync_sequence(conn, table):
+    # Після вставки з явними id послідовність PostgreSQL треба підтягнути до max(id)
+    if conn.dialect.name != 'postgresql':
+        return
+    conn.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+        f"(SELECT coalesce(max(id), 0) + 1 FROM {table.name}), false)"
+    ))
+
+
+def reset(conn):
+    # Порожні таблиці даних і агрегатів. PostgreSQL — один TRUNCATE ... RESTART IDENTITY CASCADE:
+    # сторінки звільняються без сканування рядків, послідовності id починаються з 1; від'єднані архівні
+    # секції grades ключів на ці таблиці не мають і не зачіпаються. Інші БД — DELETE по таблиці,
+    # від залежних до довідників: пакетне видалення в одній транзакції на SQLite лише повільніше
+    tables = [model.__table__ for model in RESET_ORDER] + [Base.metadata.tables[name] for name in ROLLUP_KEYS]
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text(f"TRUNCATE {', '.join(table.name for table in tables)} RESTART IDENTITY CASCADE"))
+        return
+    for table in tables:
+        conn.execute(delete(table))
+
+
+def _max_id(conn, model):
+    return conn.execute(select(func.coalesce(func.max(model.id), 0))).scalar()
+
+
+def _report(label, rows, seconds):
+    rate = rows / seconds if seconds > 0 else float('inf')
+    print(f"  {label}: {rows} рядків за {seconds:.2f} с ({rate:.0f} рядків/с)")
+
+
+# --- Генератори рядків ---
+# Нові рядки отримують послідовні id, починаючи з first_id; ключі, що вже є в БД,
+# не генеруються повторно, а їхні id додаються в ids.
+
+def iter_named_rows(names, existing, first_id, ids, field='name', extra=None):
+    next_id = first_id
+    for name in names:
+        if name in existing:
+            ids.append(existing[name])
+            continue
+        existing[name] = next_id
+        ids.append(next_id)
+        row = {'id': next_id, field: name}
+        if extra:
+            row.update(extra())
+        yield row
+        next_id += 1
+
+
+def iter_student_rows(fake, rng, n_students, existing, groups, first_id, reused):
+    # Імена, що збігаються з наявними в БД, означають того самого студента (як і раніше).
+    # Імена в межах одного запуску не запам'ятовуються, щоб пам'ять не залежала від n_students
+    next_id = first_id
+    for _ in range(n_students):
+        fullname = fake.name()
+        if fullname in existing:
+            reused.append(existing[fullname])
+            continue
+        yield {'id': next_id, 'fullname': fullname, 'group_id': rng.choice(groups)}
+        next_id += 1
+
+
+def iter_grade_rows(rng, student_ids, subjects, n_grades, existing_keys, today, group_of, teacher_of):
+    # group_of/teacher_of: групи студентів і викладачі предметів для денормалізованих колонок grades
+    for student_id in student_ids:
+        # Ключі потрібні лише в межах одного студента, тому пам'ять не росте
+        seen = existing_keys.pop(student_id, set())
+        for subject_id in subjects:
+            for _ in range(n_grades):
+                grade = round(rng.uniform(60, 100), 2)
+                date_received = today - timedelta(days=rng.randint(1, 365))
+                key = (subject_id, date_received)
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield {'student_id': student_id, 'subject_id': subject_id,
+                       'grade': grade, 'date_received': date_received,
+                       'group_id': group_of.get(student_id), 'teacher_id': teacher_of.get(subject_id)}
+
+
+def _chunk_deltas(chunk):
+    return grade_deltas((row['student_id'], row['subject_id'], row['grade']) for row in chunk)
+
+
+def _rollup_partition_grades(conn, chunk, shared):
+    # Агрегати по студенту пишемо одразу (ключі блоку не перетинаються з іншими процесами),
+    # спільні агрегати предметів і груп накопичуємо й записує координатор
+    deltas = _chunk_deltas(chunk)
+    rollups = rollup_deltas(deltas, {row['student_id']: row['group_id'] for row in chunk})
+    upsert_rollups(conn, {name: rollups[name] for name in STUDENT_ROLLUPS})
+    merge_rollups(shared, {name: values for name, values in rollups.items() if name not in STUDENT_ROLLUPS})
+
+
+def _existing_grade_keys(conn, student_ids, batch_size):
+    existing_keys = defaultdict(set)
+    for chunk in chunked(sorted(student_ids), batch_size):
+        for student_id, subject_id, date_received in conn.execute(
+            select(Grade.student_id, Grade.subject_id, Grade.date_received)
+            .where(Grade.student_id.in_(chunk))
+        ):
+            existing_keys[student_id].add((subject_id, date_received))
+    return existing_keys
+
+
+def _seed_partition(conn, fake, block, first_id, n_students, existing, groups, subjects, teacher_of, n_grades,
+                    seed, today, batch_size, reused, shared):
+    # Блок block займає id [first_id + block * PARTITION_SIZE, ... + PARTITION_SIZE).
+    # Власний RNG блоку не залежить від того, який процес і в якому порядку його обробляє
+    rng = random.Random(f"{seed}:{block}")
+    fake.seed_instance(f"{seed}:{block}")
+    start_id = first_id + block * PARTITION_SIZE
+    count = min(PARTITION_SIZE, n_students - block * PARTITION_SIZE)
+    rows = iter_student_rows(fake, rng, count, existing, groups, start_id, reused)
+    group_of = {}
+    n_new = insert_rows(conn, Student.__table__, rows, batch_size,
+                        on_chunk=lambda chunk: group_of.update((row['id'], row['group_id']) for row in chunk))
+    rows = iter_grade_rows(rng, range(start_id, start_id + n_new), subjects, n_grades, {}, today, group_of, teacher_of)
+    n_rows = insert_rows(conn, Grade.__table__, rows, batch_size,
+                         on_chunk=lambda chunk: _rollup_partition_grades(conn, chunk, shared))
+    return n_new, n_rows
+
+
+def _seed_blocks(engine, blocks, params):
+    # Кожен блок — окрема транзакція, щоб паралельні процеси не тримали довгих блокувань
+    from faker import Faker
+    fake = Faker()
+    n_students = n_grades = 0
+    reused = []
+    shared = new_rollups()
+    with engine.connect() as conn:
+        existing = dict(conn.execute(select(Student.fullname, Student.id)).all())
+        for block in blocks:
+            n_new, n_rows = _seed_partition(conn, fake, block, existing=existing, reused=reused,
+                                            shared=shared, **params)
+            conn.commit()
+            n_students += n_new
+            n_grades += n_rows
+    # Звичайні dict, щоб результат можна було передати з дочірнього процесу
+    return n_students, n_grades, reused, {name: dict(values) for name, values in shared.items()}
+
+
+def _seed_blocks_worker(url, blocks, params):
+    # Точка входу дочірнього процесу: власний engine і власне з'єднання
+    engine = create_engine(url, poolclass=NullPool)
+    try:
+        return _seed_blocks(engine, blocks, params)
+    finally:
+        engine.dispose()
+
+
+def bulk_seed(engine, overwrite=False, n_groups=4, n_teachers=7, n_subjects=12,
+              n_students=75, n_grades=30, batch_size=BATCH_SIZE, seed=None, workers=1, anchor_date=None):
+    # Однаковий seed (і anchor_date) на однаковій початковій БД дає однакові дані за будь-якої кількості workers
+    if anchor_date is None:
+        anchor_date = date.today() if seed is None else SEED_EPOCH
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    rng = random.Random(seed)
+    # Faker імпортується лише для сидування: модуль також дає константи для CLI
+    from faker import Faker
+    fake = Faker()
+    fake.seed_instance(seed)
+    today = anchor_date
+    total_rows = 0
+    started = time.perf_counter()
+    # --- Координатор: спільні таблиці-довідники ---
+    with engine.begin() as conn:
+        if overwrite:
+            reset(conn)
+
+        # --- Групи ---
+        t0 = time.perf_counter()
+        groups = []
+        rows = iter_named_rows(
+            (group_name(i) for i in range(n_groups)),
+            dict(conn.execute(select(Group.name, Group.id)).all()),
+            _max_id(conn, Group) + 1, groups,
+        )
+        n_rows = insert_rows(conn, Group.__table__, rows, batch_size)
+        sync_sequence(conn, Group.__table__)
+        total_rows += n_rows
+        _report('groups', n_rows, time.perf_counter() - t0)
+
+        # --- Викладачі ---
+        t0 = time.perf_counter()
+        teachers = []
+        rows = iter_named_rows(
+            (fake.name() for _ in range(n_teachers)),
+            dict(conn.execute(select(Teacher.fullname, Teacher.id)).all()),
+            _max_id(conn, Teacher) + 1, teachers, field='fullname',
+        )
+        n_rows = insert_rows(conn, Teacher.__table__, rows, batch_size)
+        sync_sequence(conn, Teacher.__table__)
+        total_rows += n_rows
+        _report('teachers', n_rows, time.perf_counter() - t0)
+
+        # --- Предмети ---
+        t0 = time.perf_counter()
+        subjects = []
+        rows = iter_named_rows(
+            (subject_name(i) for i in range(n_subjects)),
+            dict(conn.execute(select(Subject.name, Subject.id)).all()),
+            _max_id(conn, Subject) + 1, subjects,
+            extra=lambda: {'teacher_id': rng.choice(teachers)},
+        )
+        n_rows = insert_rows(conn, Subject.__table__, rows, batch_size)
+        sync_sequence(conn, Subject.__table__)
+        total_rows += n_rows
+        _report('subjects', n_rows, time.perf_counter() - t0)
+        teacher_of = dict(conn.execute(select(Subject.id, Subject.teacher_id).where(Subject.id.in_(subjects))).all())
+
+        first_id = _max_id(conn, Student) + 1
+
+    # --- Студенти та оцінки: блоки з неперетинними діапазонами id ---
+    t0 = time.perf_counter()
+    n_blocks = -(-n_students // PARTITION_SIZE)
+    params = {'first_id': first_id, 'n_students': n_students, 'groups': groups, 'subjects': subjects,
+              'teacher_of': teacher_of, 'n_grades': n_grades, 'seed': seed, 'today': today, 'batch_size': batch_size}
+    if engine.dialect.name == 'sqlite' and workers > 1:
+        print("  SQLite не підтримує паралельний запис, використовується 1 процес")
+        workers = 1
+    workers = max(1, min(workers, n_blocks))
+    if workers == 1:
+        results = [_seed_blocks(engine, range(n_blocks), params)]
+    else:
+        url = engine.url.render_as_string(hide_password=False)
+        bounds = [n_blocks * w // workers for w in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_seed_blocks_worker, url, range(bounds[w], bounds[w + 1]), params)
+                for w in range(workers)
+            ]
+            results = [future.result() for future in futures]
+    n_new_students = sum(r[0] for r in results)
+    n_rows = sum(r[1] for r in results)
+    seconds = time.perf_counter() - t0
+    total_rows += n_new_students + n_rows
+    _report(f'students ({workers} процес.)', n_new_students, seconds)
+    _report(f'grades ({workers} процес.)', n_rows, seconds)
+
+    with engine.begin() as conn:
+        sync_sequence(conn, Student.__table__)
+        shared = new_rollups()
+        for result in results:
+            merge_rollups(shared, result[3])
+        upsert_rollups(conn, shared)
+        # --- Оцінки для студентів, що вже були в БД ---
+        # Ключі вже наявних оцінок потрібні лише для цих студентів
+        t0 = time.perf_counter()
+        reused = list(dict.fromkeys(chain.from_iterable(r[2] for r in results)))
+        existing_keys = _existing_grade_keys(conn, reused, batch_size)
+        rows = iter_grade_rows(random.Random(f"{seed}:reused"), reused, subjects, n_grades, existing_keys, today,
+                               group_ids(conn, reused), teacher_of)
+        n_rows = insert_rows(conn, Grade.__table__, rows, batch_size,
+                             on_chunk=lambda chunk: apply_deltas(conn, _chunk_deltas(chunk)))
+        total_rows += n_rows
+        _report('grades (наявні студенти)', n_rows, time.perf_counter() - t0)
+
+    _report('Разом', total_rows, time.perf_counter() - started)
+    return total_rows
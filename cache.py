@@ -0,0 +1,207 @@
+import os
+import time
+import inspect
+import functools
+import threading
+from collections import OrderedDict, defaultdict
+from sqlalchemy import event
+
+# Кеш результатів звітних запитів (my_select) у пам'яті процесу: LRU з TTL.
+# Ключ — ім'я функції та її аргументи. Кожна функція оголошує таблиці, від яких залежить;
+# коміт сесії, що змінив рядки цих таблиць, видаляє відповідні записи.
+# Записи в обхід ORM-сесії (bulk_seed, rollups.rebuild) мають викликати invalidate() самі,
+# зміни з інших процесів видно не пізніше ніж через TTL.
+CACHE_TTL = float(os.getenv('DB_CACHE_TTL', '60'))
+CACHE_SIZE = int(os.getenv('DB_CACHE_SIZE', '1024'))
+
+_MISSING = object()
+
+
+class TTLCache:
+    # Бекенд за замовчуванням. Інший бекенд (напр. Redis) має ті самі get/set/delete/clear/stats
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._data), 'maxsize': self.maxsize, 'ttl': self.ttl,
+                    'evictions': self.evictions, 'expirations': self.expirations}
+
+
+_backend = TTLCache()
+_lock = threading.Lock()
+# таблиця -> ключі, що від неї залежать; ключі, які бекенд уже витіснив, просто не знайдуться при delete
+_keys_by_table = defaultdict(set)
+_counters = defaultdict(lambda: {'hits': 0, 'misses': 0})
+_invalidations = {'tables': 0, 'keys': 0}
+# Функції listener(tables) для похідних структур поза кешем (напр. індекс пошуку); tables=None — усе
+_listeners = []
+# Росте з кожною інвалідацією: результат, обчислений до неї, у кеш уже не потрапляє
+_generation = 0
+
+
+def set_backend(backend):
+    global _backend
+    with _lock:
+        _backend = backend
+        _keys_by_table.clear()
+
+
+def enabled():
+    return CACHE_TTL > 0 and CACHE_SIZE > 0
+
+
+def cached(*tables):
+    # Декоратор read-through: результат береться з кешу або обчислюється та зберігається
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled():
+                return fn(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (fn.__name__, tuple(bound.arguments.items()))
+            value = _backend.get(key, _MISSING)
+            with _lock:
+                _counters[fn.__name__]['hits' if value is not _MISSING else 'misses'] += 1
+                generation = _generation
+            if value is not _MISSING:
+                return value
+            value = fn(*args, **kwargs)
+            with _lock:
+                if generation == _generation:
+                    _backend.set(key, value)
+                    for table in tables:
+                        _keys_by_table[table].add(key)
+            return value
+
+        wrapper.uncached = fn
+        wrapper.cache_tables = tables
+        return wrapper
+    return decorator
+
+
+def on_invalidate(listener):
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def invalidate(tables=None):
+    # Без аргументів — очистити весь кеш
+    global _generation
+    for listener in _listeners:
+        listener(tables)
+    if tables is None:
+        with _lock:
+            _generation += 1
+            _keys_by_table.clear()
+            _invalidations['tables'] += 1
+        _backend.clear()
+        return
+    with _lock:
+        _generation += 1
+        keys = set()
+        for table in tables:
+            keys |= _keys_by_table.pop(table, set())
+        _invalidations['tables'] += len(tables)
+        _invalidations['keys'] += len(keys)
+    for key in keys:
+        _backend.delete(key)
+
+
+def stats():
+    # Лічильники попадань/промахів по функціях і стан бекенду
+    with _lock:
+        by_function = {name: dict(counter) for name, counter in _counters.items()}
+        invalidations = dict(_invalidations)
+    return {
+        'hits': sum(c['hits'] for c in by_function.values()),
+        'misses': sum(c['misses'] for c in by_function.values()),
+        'functions': by_function,
+        'invalidations': invalidations,
+        **_backend.stats(),
+    }
+
+
+# --- Інвалідація за подіями сесії ---
+# Змінені таблиці збираються при flush, а кеш чиститься лише після коміту:
+# до нього інші з'єднання (і кешовані запити) змін ще не бачать.
+
+def cascade_tables(table):
+    # Імена таблиць, які БД змінює сама при видаленні рядків table: ON DELETE CASCADE/SET NULL, транзитивно
+    result, pending = set(), [table]
+    while pending:
+        target = pending.pop()
+        for other in table.metadata.tables.values():
+            if other.name not in result and any(
+                fk.ondelete and fk.column.table is target for fk in other.foreign_keys
+            ):
+                result.add(other.name)
+                pending.append(other)
+    return result
+
+
+def _after_flush(session, flush_context):
+    changed = session.info.setdefault('cache_tables', set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, '__tablename__', None)
+        if table:
+            changed.add(table)
+    for obj in session.deleted:
+        # Залежні рядки (passive_deletes) видаляє чи відв'язує БД, і в сесії їх немає
+        if hasattr(obj, '__table__'):
+            changed.update(cascade_tables(obj.__table__))
+
+
+def _after_commit(session):
+    changed = session.info.pop('cache_tables', None)
+    if changed:
+        invalidate(changed)
+
+
+def _after_rollback(session):
+    # Лише справжній відкат транзакції БД; відкат savepoint залишає набір (зайва інвалідація не шкодить)
+    session.info.pop('cache_tables', None)
+
+
+def register(session_factory):
+    for name, listener in (('after_flush', _after_flush), ('after_commit', _after_commit),
+                           ('after_rollback', _after_rollback)):
+        if not event.contains(session_factory, name, listener):
+            event.listen(session_factory, name, listener)
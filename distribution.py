@@ -0,0 +1,162 @@
+import math
+from sqlalchemy import select, func, and_, bindparam, null
+from models import Student, Subject, Grade, SubjectGradeBuckets, GroupGradeBuckets
+from rollups import GRADE_LOW, BUCKET_WIDTH, BUCKETS, grade_bucket
+from db import connection
+from metrics import query_name
+
+# Розподіл оцінок по предметах, групах і викладачах: медіана, p10/p90 і гістограма.
+# Наближено — з гістограм subject_grade_buckets/group_grade_buckets, які rollups.py оновлює разом
+# з агрегатами: кілька десятків рядків на ключ замість усіх оцінок, похибка квантиля не більша
+# за ширину кошика. Гістограми зливаються додаванням, тож викладач і весь потік — сума гістограм
+# їхніх предметів. Точний режим (exact=True) рахує те саме по grades для перевірки.
+SCOPES = ('subject', 'group', 'teacher', 'all')
+QUANTILES = {'p10': 0.1, 'median': 0.5, 'p90': 0.9}
+
+_IDS = bindparam('ids', expanding=True)
+_GRADED = and_(Grade.student_id.isnot(None), Grade.subject_id.isnot(None))
+
+
+class DistributionError(ValueError):
+    pass
+
+
+def bucket_range(bucket):
+    # [нижня, верхня) межа кошика
+    low = GRADE_LOW + bucket * BUCKET_WIDTH
+    return low, low + BUCKET_WIDTH
+
+
+def coarse(histogram, width):
+    # Гістограма з ширшими кошиками (width — кратне BUCKET_WIDTH) для показу: [(нижня, верхня, кількість)]
+    step = max(1, round(width / BUCKET_WIDTH))
+    return [(bucket_range(start)[0], bucket_range(min(start + step, BUCKETS) - 1)[1], sum(histogram[start:start + step]))
+            for start in range(0, BUCKETS, step)]
+
+
+def quantile(histogram, q):
+    # Квантиль за гістограмою: позиція q * (n - 1), як у percentile_cont, а оцінки всередині кошика
+    # вважаються рівномірно розподіленими
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = q * (total - 1)
+    seen = 0
+    for bucket, count in enumerate(histogram):
+        if count and seen + count > rank:
+            return round(bucket_range(bucket)[0] + BUCKET_WIDTH * (rank - seen + 0.5) / count, 2)
+        seen += count
+    return round(bucket_range(BUCKETS - 1)[1], 2)
+
+
+def _summary(histogram, quantiles=None):
+    result = {'count': sum(histogram)}
+    if quantiles is None:
+        quantiles = {name: quantile(histogram, q) for name, q in QUANTILES.items()}
+    result.update(quantiles)
+    result['histogram'] = histogram
+    return result
+
+
+# --- Запити ---
+
+def _key(scope):
+    if scope not in SCOPES:
+        raise DistributionError(f"невідомий розріз {scope!r}; можливі: {', '.join(SCOPES)}")
+    return {'subject': Grade.subject_id, 'group': Student.group_id, 'teacher': Subject.teacher_id}.get(scope)
+
+
+def _approx_query(scope):
+    # (ключ, кошик, кількість) з таблиць гістограм
+    if scope == 'subject':
+        key, bucket, count = SubjectGradeBuckets.subject_id, SubjectGradeBuckets.bucket, SubjectGradeBuckets.grade_count
+        return select(key, bucket, count), key
+    if scope == 'group':
+        key, bucket, count = GroupGradeBuckets.group_id, GroupGradeBuckets.bucket, GroupGradeBuckets.grade_count
+        return select(key, bucket, count), key
+    bucket, count = SubjectGradeBuckets.bucket, func.sum(SubjectGradeBuckets.grade_count)
+    if scope == 'teacher':
+        query = (
+            select(Subject.teacher_id, bucket, count)
+            .join(Subject, Subject.id == SubjectGradeBuckets.subject_id)
+            .where(Subject.teacher_id.isnot(None))
+            .group_by(Subject.teacher_id, bucket)
+        )
+        return query, Subject.teacher_id
+    return select(null(), bucket, count).group_by(bucket), None
+
+
+def _from_grades(scope, query):
+    # Оцінки з ключем розрізу: група й викладач беруться з поточних students/subjects
+    query = query.select_from(Grade).where(_GRADED)
+    if scope == 'group':
+        query = query.join(Student, Student.id == Grade.student_id).where(Student.group_id.isnot(None))
+    elif scope == 'teacher':
+        query = query.join(Subject, Subject.id == Grade.subject_id).where(Subject.teacher_id.isnot(None))
+    return query
+
+
+def _exact_query(scope):
+    key = _key(scope)
+    bucket = grade_bucket(Grade.grade)
+    query = _from_grades(scope, select(null() if key is None else key, bucket, func.count(Grade.id)))
+    return (query.group_by(bucket) if key is None else query.group_by(key, bucket)), key
+
+
+def _histograms(conn, scope, ids, exact):
+    _key(scope)
+    query, key = _exact_query(scope) if exact else _approx_query(scope)
+    params = {}
+    if ids is not None and key is not None:
+        query, params = query.where(key.in_(_IDS)), {'ids': list(ids)}
+    result = {} if ids is None or key is None else {key_id: [0] * BUCKETS for key_id in ids}
+    for key_id, bucket, count in conn.execute(query, params):
+        result.setdefault(key_id, [0] * BUCKETS)[bucket] += int(count)
+    return result
+
+
+def _exact_quantiles(conn, scope, counts):
+    # {ключ: {назва: значення}}. PostgreSQL — percentile_cont одним запитом; інші БД — по два сусідні
+    # рядки впорядкованих оцінок на кожен квантиль (OFFSET), з тією ж інтерполяцією
+    key = _key(scope)
+    if conn.dialect.name == 'postgresql':
+        columns = [func.percentile_cont(q).within_group(Grade.grade).label(name) for name, q in QUANTILES.items()]
+        query = _from_grades(scope, select(null() if key is None else key, *columns))
+        if key is not None:
+            query = query.where(key.in_(_IDS)).group_by(key)
+        rows = conn.execute(query, {'ids': list(counts)} if key is not None else {})
+        return {row[0]: {name: round(row[i + 1], 2) for i, name in enumerate(QUANTILES)} for row in rows}
+    result = {}
+    for key_id, total in counts.items():
+        values = {}
+        for name, q in QUANTILES.items():
+            position = q * (total - 1)
+            lower = math.floor(position)
+            query = _from_grades(scope, select(Grade.grade))
+            if key is not None:
+                query = query.where(key == key_id)
+            pair = conn.execute(query.order_by(Grade.grade).limit(2).offset(lower)).scalars().all()
+            upper = pair[1] if len(pair) > 1 else pair[0]
+            values[name] = round(pair[0] + (upper - pair[0]) * (position - lower), 2)
+        result[key_id] = values
+    return result
+
+
+@query_name
+def distributions(scope, ids=None, exact=False):
+    # {id: {'count', 'p10', 'median', 'p90', 'histogram': [кількість у кожному з BUCKETS кошиків]}};
+    # scope='all' — один ключ None. Запитані id без оцінок мають count 0 і квантилі None
+    with connection() as conn:
+        histograms = _histograms(conn, scope, ids, exact)
+        if not exact:
+            return {key_id: _summary(histogram) for key_id, histogram in histograms.items()}
+        counts = {key_id: sum(histogram) for key_id, histogram in histograms.items() if sum(histogram)}
+        quantiles = _exact_quantiles(conn, scope, counts) if counts else {}
+    empty = dict.fromkeys(QUANTILES)
+    return {key_id: _summary(histogram, quantiles.get(key_id, empty)) for key_id, histogram in histograms.items()}
+
+
+def distribution(scope, key_id=None, exact=False):
+    # Розподіл для одного предмета/групи/викладача або всього потоку (scope='all')
+    result = distributions(scope, None if scope == 'all' else [key_id], exact)
+    return result.get(None if scope == 'all' else key_id)
@@ -0,0 +1,389 @@
+import os
+import re
+import time
+import atexit
+import bisect
+import inspect
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+
+try:
+    import fcntl
+except ImportError:  # Windows: файл метрик пишеться без блокування
+    fcntl = None
+
+# Інструментування запитів через події виконання курсора (do_execute діалекту) і сесії:
+# гістограми тривалості за іменем запиту, кількість рядків, очікування з'єднання з пулу,
+# тривалість транзакцій сесії та лог повільних запитів. Ім'я запиту — мітка label()/query_name
+# (select_1..select_10, cli.<дія>), без мітки — перше слово SQL (select, insert, ...).
+# Статистика накопичується в пам'яті процесу; flush() додає її до файлу у текстовому форматі
+# Prometheus (DB_METRICS_FILE — автоматично при завершенні процесу).
+METRICS_ENABLED = os.getenv('DB_METRICS', '1') not in ('0', 'false', 'no')
+METRICS_FILE = os.getenv('DB_METRICS_FILE', '')
+# Запити, довші за поріг (мс), потрапляють у лог разом із параметрами
+SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', '500'))
+# План повільного SELECT у лозі: EXPLAIN ANALYZE у PostgreSQL (виконує запит вдруге), EXPLAIN QUERY PLAN у SQLite
+SLOW_QUERY_EXPLAIN = os.getenv('DB_SLOW_QUERY_EXPLAIN', '0') in ('1', 'true', 'yes')
+# Межі кошиків гістограм, мс
+BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+MAX_LOGGED_PARAMS = 500
+
+METRICS = {
+    'db_query_duration_seconds': ('histogram', "Тривалість виконання запиту"),
+    'db_query_rows_total': ('counter', "Рядків, які повернув або змінив запит (за cursor.rowcount)"),
+    'db_query_errors_total': ('counter', "Запитів, що завершилися помилкою"),
+    'db_slow_queries_total': ('counter', "Запитів, довших за поріг повільного запиту"),
+    'db_connection_wait_seconds': ('histogram', "Очікування з'єднання з пулу"),
+    'db_transaction_duration_seconds': ('histogram', "Тривалість транзакції сесії від початку до commit/rollback"),
+}
+EXPLAIN_PREFIX = {'postgresql': 'EXPLAIN (ANALYZE, BUFFERS) ', 'sqlite': 'EXPLAIN QUERY PLAN '}
+
+logger = logging.getLogger(__name__)
+
+_name = ContextVar('query_name', default=None)
+_lock = threading.Lock()
+# (метрика, мітки) -> [кількість у кожному кошику..., у +Inf, сума мс]
+_histograms = {}
+_counters = {}
+
+
+# --- Імена запитів ---
+
+@contextmanager
+def label(name):
+    # Запити всередині блоку рахуються під цим іменем; вкладена мітка має пріоритет
+    token = _name.set(name)
+    try:
+        yield
+    finally:
+        _name.reset(token)
+
+
+def query_name(fn):
+    # Декоратор: запити функції рахуються під її ім'ям. Для генераторів мітка діє на кожному кроці
+    # ітерації, тож потокові результати теж потрапляють під ім'я функції
+    name = fn.__name__
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            with label(name):
+                return await fn(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        # Без contextmanager: обгортка стоїть на кожному виклику select_N
+        token = _name.set(name)
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            _name.reset(token)
+        return _labelled_steps(name, result) if inspect.isgenerator(result) else result
+    return wrapper
+
+
+def _labelled_steps(name, iterator):
+    while True:
+        with label(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+# --- Збір ---
+
+def _observe(metric, labels, ms):
+    i = bisect.bisect_left(BUCKETS_MS, ms)
+    with _lock:
+        histogram = _histograms.get((metric, labels))
+        if histogram is None:
+            histogram = _histograms[(metric, labels)] = [0] * (len(BUCKETS_MS) + 1) + [0.0]
+        histogram[i] += 1
+        histogram[-1] += ms
+
+
+def _inc(metric, labels, value=1):
+    with _lock:
+        _counters[(metric, labels)] = _counters.get((metric, labels), 0) + value
+
+
+def observe_wait(ms):
+    # Викликається db.connection() після отримання з'єднання з пулу
+    if METRICS_ENABLED:
+        _observe('db_connection_wait_seconds', (), ms)
+
+
+def _do_execute(cursor, statement, parameters, context):
+    _timed(context.dialect.do_execute, cursor, statement, parameters, context, False)
+    return True
+
+
+def _do_execute_no_params(cursor, statement, context):
+    _timed(context.dialect.do_execute_no_params, cursor, statement, None, context, False)
+    return True
+
+
+def _do_executemany(cursor, statement, parameters, context):
+    _timed(context.dialect.do_executemany, cursor, statement, parameters, context, True)
+    return True
+
+
+def _timed(execute, cursor, statement, parameters, context, executemany):
+    # Виконує запит методом діалекту (як без подій) і записує тривалість під поточною міткою
+    name = _name.get() or _statement_kind(statement)
+    labels = (('query', name),)
+    started = time.perf_counter()
+    try:
+        if parameters is None:
+            execute(cursor, statement, context)
+        else:
+            execute(cursor, statement, parameters, context)
+    except Exception:
+        _inc('db_query_errors_total', labels)
+        raise
+    ms = (time.perf_counter() - started) * 1000
+    _observe('db_query_duration_seconds', labels, ms)
+    # SQLite та серверні курсори не знають кількості рядків SELECT до вибірки (rowcount = -1)
+    rows = cursor.rowcount
+    if rows is not None and rows > 0:
+        _inc('db_query_rows_total', labels, rows)
+    if ms >= SLOW_QUERY_MS:
+        _log_slow(context.root_connection, name, ms, statement, parameters, executemany)
+
+
+def _statement_kind(statement):
+    words = statement.split(None, 1)
+    return words[0].lower() if words else 'unknown'
+
+
+def _log_slow(conn, name, ms, statement, parameters, executemany):
+    _inc('db_slow_queries_total', (('query', name),))
+    if executemany:
+        params = f"{len(parameters)} наборів, перший: {parameters[0]!r}" if parameters else '[]'
+    else:
+        params = repr(parameters)
+    if len(params) > MAX_LOGGED_PARAMS:
+        params = params[:MAX_LOGGED_PARAMS] + '...'
+    plan = _explain(conn, statement, parameters) if SLOW_QUERY_EXPLAIN and not executemany else None
+    logger.warning("Повільний запит %s: %.1f мс\n%s\nПараметри: %s%s",
+                   name, ms, statement.strip(), params, f"\nПлан:\n{plan}" if plan else '')
+
+
+def _explain(conn, statement, parameters):
+    prefix = EXPLAIN_PREFIX.get(conn.dialect.name)
+    # EXPLAIN ANALYZE виконує запит повторно, тож лише для запитів без побічних ефектів
+    if prefix is None or _statement_kind(statement) not in ('select', 'with'):
+        return None
+    postgresql = conn.dialect.name == 'postgresql'
+    # Курсор DBAPI напряму: без подій engine і без рекурсії в інструментування
+    cursor = conn.connection.cursor()
+    try:
+        if postgresql:
+            # Помилка EXPLAIN не повинна зламати транзакцію викликача
+            cursor.execute('SAVEPOINT metrics_explain')
+        try:
+            cursor.execute(prefix + statement, *(() if parameters is None else (parameters,)))
+            plan = '\n'.join(str(row[-1]) for row in cursor.fetchall())
+        except Exception as e:
+            if postgresql:
+                cursor.execute('ROLLBACK TO SAVEPOINT metrics_explain')
+            logger.debug("EXPLAIN не вдався: %s", e)
+            plan = None
+        if postgresql:
+            cursor.execute('RELEASE SAVEPOINT metrics_explain')
+        return plan
+    finally:
+        cursor.close()
+
+
+def _after_begin(session, transaction, connection):
+    session.info.setdefault('metrics_began', time.perf_counter())
+
+
+def _after_commit(session):
+    session.info['metrics_outcome'] = 'commit'
+
+
+def _after_transaction_end(session, transaction):
+    # Зовнішня транзакція сесії: commit, rollback або закриття сесії без commit (теж rollback)
+    if transaction.parent is not None:
+        return
+    began = session.info.pop('metrics_began', None)
+    outcome = session.info.pop('metrics_outcome', 'rollback')
+    if began is not None:
+        ms = (time.perf_counter() - began) * 1000
+        _observe('db_transaction_duration_seconds', (('query', _name.get() or 'session'), ('outcome', outcome)), ms)
+
+
+def register_engine(engine):
+    # Для AsyncEngine передається engine.sync_engine.
+    # Події діалекту (do_execute*), а не before/after_cursor_execute: слухач подій Connection
+    # змушує SQLAlchemy будувати диспетчер для кожного нового з'єднання, що коштує ~30 мкс на
+    # виклик select_N проти ~8 мкс тут разом із мітками (вимірювання — у README)
+    if not METRICS_ENABLED:
+        return
+    event.listen(engine, 'do_execute', _do_execute)
+    event.listen(engine, 'do_execute_no_params', _do_execute_no_params)
+    event.listen(engine, 'do_executemany', _do_executemany)
+
+
+def register(session_factory):
+    if not METRICS_ENABLED:
+        return
+    event.listen(session_factory, 'after_begin', _after_begin)
+    event.listen(session_factory, 'after_commit', _after_commit)
+    event.listen(session_factory, 'after_transaction_end', _after_transaction_end)
+
+
+# --- Формат Prometheus ---
+
+def collect(reset=False):
+    # Зібране в процесі як ряди Prometheus: {(ім'я ряду, мітки): значення}
+    with _lock:
+        histograms = {key: list(value) for key, value in _histograms.items()}
+        counters = dict(_counters)
+        if reset:
+            _histograms.clear()
+            _counters.clear()
+    series = {}
+    for (metric, labels), value in counters.items():
+        series[(metric, labels)] = value
+    for (metric, labels), histogram in histograms.items():
+        cumulative = 0
+        for le, count in zip(BUCKETS_MS + (None,), histogram):
+            cumulative += count
+            series[(f'{metric}_bucket', labels + (('le', '+Inf' if le is None else f'{le / 1000:g}'),))] = cumulative
+        series[(f'{metric}_sum', labels)] = histogram[-1] / 1000
+        series[(f'{metric}_count', labels)] = cumulative
+    return series
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _unescape(value):
+    return re.sub(r'\\(.)', lambda m: '\n' if m.group(1) == 'n' else m.group(1), value)
+
+
+def render(series):
+    lines = []
+    for metric, (kind, help_text) in METRICS.items():
+        samples = sorted((key for key in series if _base_name(key[0]) == metric), key=_sample_order)
+        if not samples:
+            continue
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, labels in samples:
+            text = ','.join(f'{key}="{_escape(value)}"' for key, value in labels)
+            lines.append(f"{name}{{{text}}} {series[(name, labels)]:g}" if text else f"{name} {series[(name, labels)]:g}")
+    return '\n'.join(lines) + '\n'
+
+
+_SAMPLE = re.compile(r'^([a-zA-Z_:][\w:]*)(?:\{(.*)\})?\s+(\S+)$')
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def parse(text):
+    series = {}
+    for line in text.splitlines():
+        match = _SAMPLE.match(line)
+        if line.startswith('#') or not match:
+            continue
+        name, labels, value = match.groups()
+        labels = tuple((key, _unescape(raw)) for key, raw in _LABEL.findall(labels or ''))
+        series[(name, labels)] = float(value)
+    return series
+
+
+def _sample_order(key):
+    # Кошики гістограми — за зростанням межі le, +Inf останнім
+    name, labels = key
+    return name, tuple((k, float(v) if k == 'le' else 0.0, v if k != 'le' else '') for k, v in labels)
+
+
+def _base_name(name):
+    for suffix in ('_bucket', '_sum', '_count'):
+        if name.endswith(suffix) and name[:-len(suffix)] in METRICS:
+            return name[:-len(suffix)]
+    return name
+
+
+def read(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return parse(f.read())
+
+
+def flush(path=None):
+    # Додає зібране з моменту попереднього flush() до лічильників у файлі (усі ряди — лічильники,
+    # тож кілька процесів можуть писати в один файл по черзі)
+    path = path or METRICS_FILE
+    series = collect(reset=True)
+    if not path or not series:
+        return
+    with open(path + '.lock', 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        merged = read(path)
+        for key, value in series.items():
+            merged[key] = merged.get(key, 0) + value
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(render(merged))
+        os.replace(tmp, path)
+
+
+# --- Зведення для CLI ---
+
+def quantile(buckets, q):
+    # Оцінка квантиля за кумулятивними кошиками [(межа, кількість)] з лінійною інтерполяцією
+    total = buckets[-1][1] if buckets else 0
+    if not total:
+        return 0.0
+    rank = q * total
+    prev_le, prev_count = 0.0, 0
+    for le, count in buckets:
+        if count >= rank:
+            if le == float('inf'):
+                return prev_le
+            if count == prev_count:
+                return le
+            return prev_le + (le - prev_le) * (rank - prev_count) / (count - prev_count)
+        prev_le, prev_count = le, count
+    return prev_le
+
+
+def summary(series, metric='db_query_duration_seconds'):
+    # {мітки без le: {'count', 'avg_ms', 'p50_ms', 'p95_ms', 'p99_ms'}} для гістограми metric
+    buckets = {}
+    for (name, labels), value in series.items():
+        if name == f'{metric}_bucket':
+            le = dict(labels)['le']
+            key = tuple(item for item in labels if item[0] != 'le')
+            buckets.setdefault(key, []).append((float('inf') if le == '+Inf' else float(le), value))
+    result = {}
+    for key, points in buckets.items():
+        points.sort()
+        count = series.get((f'{metric}_count', key), 0)
+        total = series.get((f'{metric}_sum', key), 0.0)
+        result[key] = {
+            'count': int(count),
+            'avg_ms': total / count * 1000 if count else 0.0,
+            'p50_ms': quantile(points, 0.5) * 1000,
+            'p95_ms': quantile(points, 0.95) * 1000,
+            'p99_ms': quantile(points, 0.99) * 1000,
+        }
+    return result
+
+
+if METRICS_ENABLED and METRICS_FILE:
+    atexit.register(flush)
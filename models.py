@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Float
-from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy import Column, Integer, SmallInteger, String, ForeignKey, Date, Float, Numeric, Index, UniqueConstraint, func
+from sqlalchemy.orm import relationship, declarative_base, column_property
 
 Base = declarative_base()
 
@@ -7,36 +7,131 @@ class Group(Base):
     __tablename__ = 'groups'
     id = Column(Integer, primary_key=True)
     name = Column(String(50), nullable=False, unique=True)
-    students = relationship('Student', back_populates='group')
+    # Видалення групи: students.group_id обнуляє БД (ON DELETE SET NULL), сесія студентів не завантажує
+    students = relationship('Student', back_populates='group', passive_deletes='all')
 
 class Student(Base):
     __tablename__ = 'students'
+    __table_args__ = (
+        # Нечіткий пошук (search.py), лише PostgreSQL з pg_trgm
+        Index('ix_students_fullname_trgm', 'fullname', postgresql_using='gin',
+              postgresql_ops={'fullname': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
     id = Column(Integer, primary_key=True)
     fullname = Column(String(100), nullable=False)
-    group_id = Column(Integer, ForeignKey('groups.id'))
+    # active_history: rollups.py бере старе значення з історії атрибута, зокрема в протермінованого
+    # після commit() об'єкта (інакше воно не завантажується до зміни)
+    group_id = column_property(Column(Integer, ForeignKey('groups.id', ondelete='SET NULL'), index=True),
+                               active_history=True)
     group = relationship('Group', back_populates='students')
-    grades = relationship('Grade', back_populates='student')
+    # Оцінки видаляє БД (ON DELETE CASCADE) одним DELETE студента; агрегати поправляє rollups.py
+    grades = relationship('Grade', back_populates='student', passive_deletes='all')
 
 class Teacher(Base):
     __tablename__ = 'teachers'
+    __table_args__ = (
+        Index('ix_teachers_fullname_trgm', 'fullname', postgresql_using='gin',
+              postgresql_ops={'fullname': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
     id = Column(Integer, primary_key=True)
     fullname = Column(String(100), nullable=False)
-    subjects = relationship('Subject', back_populates='teacher')
+    subjects = relationship('Subject', back_populates='teacher', passive_deletes='all')
 
 class Subject(Base):
     __tablename__ = 'subjects'
+    __table_args__ = (
+        Index('ix_subjects_name_trgm', 'name', postgresql_using='gin',
+              postgresql_ops={'name': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
     id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
-    teacher_id = Column(Integer, ForeignKey('teachers.id'))
+    teacher_id = column_property(Column(Integer, ForeignKey('teachers.id', ondelete='SET NULL'), index=True),
+                                 active_history=True)
     teacher = relationship('Teacher', back_populates='subjects')
-    grades = relationship('Grade', back_populates='subject')
+    grades = relationship('Grade', back_populates='subject', passive_deletes='all')
+
+# Пошук за префіксом імені в TUI без урахування регістру: lower(ім'я) LIKE 'abc%' у PostgreSQL, діапазон у SQLite
+Index('ix_students_fullname_lower', func.lower(Student.fullname).label('fullname_lower'),
+      postgresql_ops={'fullname_lower': 'text_pattern_ops'})
+Index('ix_teachers_fullname_lower', func.lower(Teacher.fullname).label('fullname_lower'),
+      postgresql_ops={'fullname_lower': 'text_pattern_ops'})
+Index('ix_subjects_name_lower', func.lower(Subject.name).label('name_lower'),
+      postgresql_ops={'name_lower': 'text_pattern_ops'})
 
 class Grade(Base):
     __tablename__ = 'grades'
+    __table_args__ = (
+        # Одна оцінка студента з предмета на день; заодно індекс для select_9/select_10
+        UniqueConstraint('student_id', 'subject_id', 'date_received', name='uq_grades_student_subject_date'),
+        # select_2/3/7/8: фільтр за предметом, агрегація grade без звернення до таблиці (PostgreSQL)
+        Index('ix_grades_subject_student', 'subject_id', 'student_id', postgresql_include=['grade']),
+        # Денормалізований режим (DB_DENORMALIZED_GRADES): select_3/select_7 за предметом і групою,
+        # select_8 за викладачем — без з'єднання з students/subjects
+        Index('ix_grades_subject_group', 'subject_id', 'group_id',
+              postgresql_include=['student_id', 'grade', 'date_received']),
+        Index('ix_grades_teacher', 'teacher_id', postgresql_include=['grade', 'date_received']),
+    )
     id = Column(Integer, primary_key=True)
-    student_id = Column(Integer, ForeignKey('students.id'))
-    subject_id = Column(Integer, ForeignKey('subjects.id'))
-    grade = Column(Float, nullable=False)
+    # Старі значення потрібні rollups.py для від'ємної дельти (див. Student.group_id)
+    student_id = column_property(Column(Integer, ForeignKey('students.id', ondelete='CASCADE')), active_history=True)
+    subject_id = column_property(Column(Integer, ForeignKey('subjects.id', ondelete='CASCADE')), active_history=True)
+    grade = column_property(Column(Float, nullable=False), active_history=True)
     date_received = Column(Date, nullable=False)
+    # Копії students.group_id і subjects.teacher_id, узгоджуються в rollups.py. Без зовнішніх ключів:
+    # значення похідні, а перевірка FK коштувала б на кожній вставці оцінки
+    group_id = Column(Integer)
+    teacher_id = Column(Integer)
     student = relationship('Student', back_populates='grades')
     subject = relationship('Subject', back_populates='grades')
+
+# --- Агреговані таблиці (підтримуються інкрементально, див. rollups.py) ---
+
+class StudentSubjectStats(Base):
+    __tablename__ = 'student_subject_stats'
+    __table_args__ = (
+        # Топ-K по предмету: сканування індексу від найбільшого середнього
+        Index('ix_student_subject_stats_subject_avg', 'subject_id', 'avg_grade'),
+    )
+    student_id = Column(Integer, primary_key=True)
+    subject_id = Column(Integer, primary_key=True, index=True)
+    grade_sum = Column(Numeric(14, 2), nullable=False)
+    grade_count = Column(Integer, nullable=False)
+    avg_grade = Column(Numeric(5, 2))
+
+class StudentStats(Base):
+    __tablename__ = 'student_stats'
+    student_id = Column(Integer, primary_key=True, autoincrement=False)
+    grade_sum = Column(Numeric(14, 2), nullable=False)
+    grade_count = Column(Integer, nullable=False)
+    # Загальний топ-K: сканування індексу від найбільшого середнього
+    avg_grade = Column(Numeric(5, 2), index=True)
+
+class SubjectStats(Base):
+    __tablename__ = 'subject_stats'
+    subject_id = Column(Integer, primary_key=True, autoincrement=False)
+    grade_sum = Column(Numeric(14, 2), nullable=False)
+    grade_count = Column(Integer, nullable=False)
+
+class GroupSubjectStats(Base):
+    __tablename__ = 'group_subject_stats'
+    group_id = Column(Integer, primary_key=True)
+    subject_id = Column(Integer, primary_key=True, index=True)
+    grade_sum = Column(Numeric(14, 2), nullable=False)
+    grade_count = Column(Integer, nullable=False)
+
+# Гістограми оцінок: кошик bucket шириною rollups.BUCKET_WIDTH від rollups.GRADE_LOW.
+# Гістограма викладача і всього потоку — сума гістограм предметів (distribution.py)
+
+class SubjectGradeBuckets(Base):
+    __tablename__ = 'subject_grade_buckets'
+    subject_id = Column(Integer, primary_key=True)
+    bucket = Column(SmallInteger, primary_key=True)
+    grade_sum = Column(Numeric(14, 2), nullable=False)
+    grade_count = Column(Integer, nullable=False)
+
+class GroupGradeBuckets(Base):
+    __tablename__ = 'group_grade_buckets'
+    group_id = Column(Integer, primary_key=True)
+    bucket = Column(SmallInteger, primary_key=True)
+    grade_sum = Column(Numeric(14, 2), nullable=False)
+    grade_count = Column(Integer, nullable=False)
@@ -0,0 +1,98 @@
+import os
+import asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from db import DB_URL, POOL_SIZE, MAX_OVERFLOW, async_url, engine_options
+from metrics import query_name, register_engine
+from my_select import (
+    top_students_query, ranged, QUERY_3, QUERY_4, QUERY_5, QUERY_6, QUERY_7, QUERY_8, QUERY_9, QUERY_10,
+    QUERY_3_RANGE, QUERY_4_RANGE, QUERY_7_RANGE, QUERY_8_RANGE,
+)
+
+# Асинхронні версії select_1..select_10 для asyncio-застосунків.
+# Запити ті самі, що й у my_select, виконуються через AsyncConnection і не блокують цикл подій.
+ASYNC_DB_URL = os.getenv('ASYNC_DB_URL') or async_url(DB_URL)
+
+async_engine = create_async_engine(ASYNC_DB_URL, **engine_options(ASYNC_DB_URL))
+# Події engine спрацьовують на синхронному ядрі AsyncEngine; мітки передаються через contextvars
+register_engine(async_engine.sync_engine)
+
+
+async def _all(query, params=None):
+    async with async_engine.connect() as conn:
+        return (await conn.execute(query, params)).all()
+
+
+async def _scalar(query, params=None):
+    async with async_engine.connect() as conn:
+        return (await conn.execute(query, params)).scalar()
+
+
+async def top_students(k=5, subject_id=None, since=None, until=None):
+    return await _all(*top_students_query(k, subject_id, since, until))
+
+
+@query_name
+async def select_1(k=5, since=None, until=None):
+    return await top_students(k, since=since, until=until)
+
+
+@query_name
+async def select_2(subject_id, since=None, until=None):
+    result = await top_students(1, subject_id, since, until)
+    return result[0] if result else None
+
+
+@query_name
+async def select_3(subject_id, since=None, until=None):
+    return await _all(*ranged(QUERY_3, QUERY_3_RANGE, {'subject_id': subject_id}, since, until))
+
+
+@query_name
+async def select_4(since=None, until=None):
+    return await _scalar(*ranged(QUERY_4, QUERY_4_RANGE, {}, since, until))
+
+
+@query_name
+async def select_5(teacher_id):
+    return await _all(QUERY_5, {'teacher_id': teacher_id})
+
+
+@query_name
+async def select_6(group_id):
+    return await _all(QUERY_6, {'group_id': group_id})
+
+
+@query_name
+async def select_7(group_id, subject_id, since=None, until=None):
+    return await _all(*ranged(QUERY_7, QUERY_7_RANGE, {'group_id': group_id, 'subject_id': subject_id}, since, until))
+
+
+@query_name
+async def select_8(teacher_id, since=None, until=None):
+    return await _scalar(*ranged(QUERY_8, QUERY_8_RANGE, {'teacher_id': teacher_id}, since, until))
+
+
+@query_name
+async def select_9(student_id):
+    return await _all(QUERY_9, {'student_id': student_id})
+
+
+@query_name
+async def select_10(student_id, subject_id):
+    return await _all(QUERY_10, {'student_id': student_id, 'subject_id': subject_id})
+
+
+async def gather_reports(*calls, limit=POOL_SIZE + MAX_OVERFLOW):
+    # Незалежні звіти паралельно через пул; не більше limit одночасних запитів,
+    # щоб не чекати на з'єднання довше за pool_timeout
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(call):
+        async with semaphore:
+            return await call
+
+    return await asyncio.gather(*(run(call) for call in calls))
+
+
+async def dispose():
+    await async_engine.dispose()
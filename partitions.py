@@ -0,0 +1,131 @@
+import re
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import select, func, cast, text, table, column, Numeric
+from sqlalchemy.exc import DBAPIError
+from models import Grade
+from rollups import apply_deltas, grade_bucket
+
+# Місячні секції grades у PostgreSQL (міграція c41e7a9d2f53): grades_YYYY_MM за date_received
+# і grades_default для дат поза секціями. Звіти з since/until читають лише секції діапазону.
+# Старі секції від'єднуються без перезапису даних (DETACH PARTITION) і лишаються окремими
+# таблицями-архівами без зовнішніх ключів або видаляються; агрегати rollups зменшуються на їхні суми.
+MONTHS_AHEAD = 12
+DEFAULT_PARTITION = 'grades_default'
+
+_BOUNDS = re.compile(r"FROM \('([\d-]+)'\) TO \('([\d-]+)'\)")
+
+
+class PartitionError(Exception):
+    pass
+
+
+def _require_postgresql(conn):
+    if conn.dialect.name != 'postgresql':
+        raise PartitionError("секціонування grades доступне лише в PostgreSQL")
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(day, months):
+    month = day.month - 1 + months
+    return day.replace(year=day.year + month // 12, month=month % 12 + 1, day=1)
+
+
+def partition_name(month):
+    return f"grades_{month:%Y_%m}"
+
+
+def list_partitions(conn):
+    # [(ім'я, перший день, день після останнього, оцінка кількості рядків)]; межі None — секція за замовчуванням
+    _require_postgresql(conn)
+    rows = conn.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.reltuples::bigint "
+        "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'grades'::regclass ORDER BY c.relname"
+    )).all()
+    if not rows and not conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'grades'::regclass"
+    )).scalar():
+        raise PartitionError("таблиця grades не секціонована: виконайте alembic upgrade head")
+    result = []
+    for name, bound, estimate in rows:
+        match = _BOUNDS.search(bound)
+        start, end = (date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2))) if match else (None, None)
+        result.append((name, start, end, max(estimate, 0)))
+    return result
+
+
+def _create_partition(conn, month):
+    # Рядки місяця, що вже лежать у grades_default, заважають CREATE ... PARTITION OF: секція за замовчуванням
+    # від'єднується, нова створюється, рядки переносяться в неї, і grades_default приєднується назад
+    bounds = f"FROM ('{month}') TO ('{add_months(month, 1)}')"
+    create = f"CREATE TABLE {partition_name(month)} PARTITION OF grades FOR VALUES {bounds}"
+    in_month = f"date_received >= '{month}' AND date_received < '{add_months(month, 1)}'"
+    if not conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_month})")).scalar():
+        conn.execute(text(create))
+        return
+    columns = ', '.join(column.name for column in Grade.__table__.columns)
+    conn.execute(text(f"ALTER TABLE grades DETACH PARTITION {DEFAULT_PARTITION}"))
+    conn.execute(text(create))
+    conn.execute(text(f"INSERT INTO grades ({columns}) SELECT {columns} FROM {DEFAULT_PARTITION} WHERE {in_month}"))
+    conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_month}"))
+    conn.execute(text(f"ALTER TABLE grades ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+
+
+def ensure_partitions(conn, until=None):
+    # Створює відсутні місячні секції від останньої наявної до until (за замовчуванням — MONTHS_AHEAD наперед)
+    existing = {start for _, start, _, _ in list_partitions(conn) if start is not None}
+    until = month_start(until or add_months(date.today(), MONTHS_AHEAD))
+    month = max(existing) if existing else month_start(date.today())
+    created = []
+    while month <= until:
+        if month not in existing:
+            try:
+                _create_partition(conn, month)
+            except DBAPIError as e:
+                raise PartitionError(
+                    f"не вдалося створити секцію {partition_name(month)}: {str(e.orig).splitlines()[0]}"
+                ) from e
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def drop_foreign_keys(conn, name):
+    # Від'єднана секція зберігає копії зовнішніх ключів grades. Архів не повинен посилатися на живі рядки:
+    # інакше видалення студента або падає (NO ACTION), або мовчки стирає його архів (CASCADE, TRUNCATE)
+    for (constraint,) in conn.execute(text(
+        "SELECT conname FROM pg_constraint WHERE conrelid = CAST(:name AS regclass) AND contype = 'f'"
+    ), {'name': name}):
+        conn.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"'))
+
+
+def detach_partitions(conn, before, drop=False):
+    # Від'єднує секції, що повністю лежать до дати before. Дані не копіюються: DETACH змінює лише
+    # каталог, а агрегати зменшуються одним GROUP BY по кожній від'єднаній секції
+    detached = []
+    for name, start, end, _ in list_partitions(conn):
+        if end is None or end > before:
+            continue
+        partition = table(name, column('student_id'), column('subject_id'), column('grade'))
+        bucket = grade_bucket(partition.c.grade)
+        deltas = {
+            (student_id, subject_id, bucket_id): [-Decimal(grade_sum), -grade_count]
+            for student_id, subject_id, bucket_id, grade_sum, grade_count in conn.execute(
+                select(partition.c.student_id, partition.c.subject_id, bucket,
+                       func.sum(cast(partition.c.grade, Numeric(14, 2))), func.count())
+                .where(partition.c.student_id.isnot(None), partition.c.subject_id.isnot(None))
+                .group_by(partition.c.student_id, partition.c.subject_id, bucket)
+            )
+        }
+        apply_deltas(conn, deltas)
+        conn.execute(text(f"ALTER TABLE grades DETACH PARTITION {name}"))
+        if drop:
+            conn.execute(text(f"DROP TABLE {name}"))
+        else:
+            drop_foreign_keys(conn, name)
+        detached.append(name)
+    return detached
@@ -0,0 +1,511 @@
+import math
+from collections import defaultdict
+from decimal import Decimal
+from sqlalchemy import (
+    event, inspect, select, insert, update, delete, func, cast, case, and_, or_, bindparam, literal_column, tuple_,
+    Integer, Float, Numeric,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+from models import Base, Group, Teacher, Student, Subject, Grade, StudentSubjectStats
+
+# Агрегати оцінок: сума та кількість на ключ, тож середнє читається без проходу по grades.
+# Викладач і весь потік — це суми по subject_stats (кілька рядків), окремих таблиць не треба.
+ROLLUP_KEYS = {
+    'student_subject_stats': ('student_id', 'subject_id'),
+    'student_stats': ('student_id',),
+    'subject_stats': ('subject_id',),
+    'group_subject_stats': ('group_id', 'subject_id'),
+    # Гістограми оцінок (distribution.py): кошик фіксованої ширини на проміжку GRADE_LOW..GRADE_HIGH
+    'subject_grade_buckets': ('subject_id', 'bucket'),
+    'group_grade_buckets': ('group_id', 'bucket'),
+}
+# Таблиці з ключем по студенту: паралельні процеси сидування пишуть у них без конфліктів
+STUDENT_ROLLUPS = ('student_subject_stats', 'student_stats')
+# Таблиці з готовим середнім avg_grade під індекс рейтингу (select_1/select_2)
+RANKED_ROLLUPS = ('student_subject_stats', 'student_stats')
+UPSERT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+IN_CHUNK = 10000
+# Оцінки лежать у 60..100: 80 кошиків по пів бала; крайні значення потрапляють у крайні кошики
+GRADE_LOW = 60
+GRADE_HIGH = 100
+BUCKET_WIDTH = 0.5
+BUCKETS = int((GRADE_HIGH - GRADE_LOW) / BUCKET_WIDTH)
+
+
+def bucket_of(grade):
+    if grade >= GRADE_HIGH:
+        return BUCKETS - 1
+    if grade < GRADE_LOW:
+        return 0
+    return int(math.floor((grade - GRADE_LOW) / BUCKET_WIDTH))
+
+
+def grade_bucket(grade):
+    # SQL-відповідник bucket_of
+    return case(
+        (grade >= literal_column(repr(GRADE_HIGH)), literal_column(str(BUCKETS - 1))),
+        (grade < literal_column(repr(GRADE_LOW)), literal_column('0')),
+        else_=cast(func.floor((grade - literal_column(repr(GRADE_LOW))) / literal_column(repr(BUCKET_WIDTH), Float)),
+                   Integer),
+    )
+
+
+def new_rollups():
+    return {name: defaultdict(lambda: [Decimal(0), 0]) for name in ROLLUP_KEYS}
+
+
+def _add(values, key, grade_sum, grade_count):
+    entry = values[key]
+    entry[0] += grade_sum
+    entry[1] += grade_count
+
+
+def grade_deltas(rows, sign=1, deltas=None):
+    # rows: (student_id, subject_id, grade); результат: (student_id, subject_id, кошик) -> [сума, кількість]
+    if deltas is None:
+        deltas = defaultdict(lambda: [Decimal(0), 0])
+    for student_id, subject_id, grade in rows:
+        if student_id is None or subject_id is None:
+            continue
+        _add(deltas, (student_id, subject_id, bucket_of(grade)), sign * Decimal(str(grade)), sign)
+    return deltas
+
+
+def group_ids(conn, student_ids):
+    student_ids = sorted(student_ids)
+    result = {}
+    for i in range(0, len(student_ids), IN_CHUNK):
+        result.update(conn.execute(
+            select(Student.id, Student.group_id).where(Student.id.in_(student_ids[i:i + IN_CHUNK]))
+        ).all())
+    return result
+
+
+def rollup_deltas(deltas, group_of, rollups=None):
+    # Розкладає дельти (студент, предмет, кошик) по всіх агрегованих таблицях
+    if rollups is None:
+        rollups = new_rollups()
+    for (student_id, subject_id, bucket), (grade_sum, grade_count) in deltas.items():
+        if not grade_count and not grade_sum:
+            continue
+        _add(rollups['student_subject_stats'], (student_id, subject_id), grade_sum, grade_count)
+        _add(rollups['student_stats'], (student_id,), grade_sum, grade_count)
+        _add(rollups['subject_stats'], (subject_id,), grade_sum, grade_count)
+        _add(rollups['subject_grade_buckets'], (subject_id, bucket), grade_sum, grade_count)
+        group_id = group_of.get(student_id)
+        if group_id is not None:
+            _add(rollups['group_subject_stats'], (group_id, subject_id), grade_sum, grade_count)
+            _add(rollups['group_grade_buckets'], (group_id, bucket), grade_sum, grade_count)
+    return rollups
+
+
+def merge_rollups(target, source):
+    for name, values in source.items():
+        for key, (grade_sum, grade_count) in values.items():
+            _add(target[name], key, grade_sum, grade_count)
+    return target
+
+
+def upsert_rollups(conn, rollups):
+    for name, values in rollups.items():
+        values = {key: value for key, value in values.items() if value[0] or value[1]}
+        if not values:
+            continue
+        table = Base.metadata.tables[name]
+        keys = ROLLUP_KEYS[name]
+        rows = [dict(zip(keys, key), grade_sum=value[0], grade_count=value[1]) for key, value in values.items()]
+        stmt = UPSERT_INSERTS[conn.dialect.name](table)
+        set_ = {
+            'grade_sum': table.c.grade_sum + stmt.excluded.grade_sum,
+            'grade_count': table.c.grade_count + stmt.excluded.grade_count,
+        }
+        if name in RANKED_ROLLUPS:
+            for row in rows:
+                row['avg_grade'] = round(row['grade_sum'] / row['grade_count'], 2) if row['grade_count'] > 0 else None
+            set_['avg_grade'] = func.round(set_['grade_sum'] / func.nullif(set_['grade_count'], 0), 2)
+        stmt = stmt.on_conflict_do_update(index_elements=keys, set_=set_)
+        conn.execute(stmt, rows)
+        # Ключі без жодної оцінки прибираємо, щоб середнє не ділилося на нуль
+        emptied = [{f'b_{k}': row[k] for k in keys} for row in rows if row['grade_count'] < 0]
+        if emptied:
+            conn.execute(
+                delete(table).where(and_(*(table.c[k] == bindparam(f'b_{k}') for k in keys)),
+                                    table.c.grade_count <= 0),
+                emptied,
+            )
+
+
+def apply_deltas(conn, deltas):
+    deltas = {key: value for key, value in deltas.items() if value[0] or value[1]}
+    if not deltas:
+        return
+    group_of = group_ids(conn, {key[0] for key in deltas})
+    upsert_rollups(conn, rollup_deltas(deltas, group_of))
+
+
+def move_student(conn, student_id, old_group_id, new_group_id, pending=None):
+    # Студент перейшов в іншу групу: його суми переносяться між group_subject_stats і group_grade_buckets,
+    # а його оцінки отримують нову grades.group_id. pending — дельти оцінок, уже записаних у grades,
+    # але ще не внесених в агрегати (той самий flush): кошики рахуються по grades і їх треба відняти
+    rollups = {name: defaultdict(lambda: [Decimal(0), 0]) for name in ('group_subject_stats', 'group_grade_buckets')}
+
+    def move(name, key, grade_sum, grade_count):
+        if old_group_id is not None:
+            _add(rollups[name], (old_group_id, key), -grade_sum, -grade_count)
+        if new_group_id is not None:
+            _add(rollups[name], (new_group_id, key), grade_sum, grade_count)
+
+    for subject_id, grade_sum, grade_count in conn.execute(
+        select(StudentSubjectStats.subject_id, StudentSubjectStats.grade_sum, StudentSubjectStats.grade_count)
+        .where(StudentSubjectStats.student_id == student_id)
+    ):
+        move('group_subject_stats', subject_id, grade_sum, grade_count)
+    bucket = grade_bucket(Grade.grade)
+    for bucket_id, grade_sum, grade_count in conn.execute(
+        select(bucket, func.sum(cast(Grade.grade, Numeric(14, 2))), func.count(Grade.id))
+        .where(Grade.student_id == student_id, Grade.subject_id.isnot(None))
+        .group_by(bucket)
+    ):
+        move('group_grade_buckets', bucket_id, grade_sum, grade_count)
+    for (pending_student, _, bucket_id), (grade_sum, grade_count) in (pending or {}).items():
+        if pending_student == student_id:
+            move('group_grade_buckets', bucket_id, -grade_sum, -grade_count)
+    upsert_rollups(conn, rollups)
+    conn.execute(update(Grade.__table__).where(Grade.student_id == student_id).values(group_id=new_group_id))
+
+
+# --- Денормалізовані group_id/teacher_id в grades ---
+# Копії students.group_id і subjects.teacher_id, щоб звіти за групою чи викладачем читали лише grades.
+# Оновлюються разом з агрегатами: move_student/move_subject при зміні власника, fill_grade_owners
+# для нових оцінок, rebuild — для всієї таблиці.
+_GRADE_GROUP = select(Student.group_id).where(Student.id == Grade.student_id).scalar_subquery()
+_GRADE_TEACHER = select(Subject.teacher_id).where(Subject.id == Grade.subject_id).scalar_subquery()
+
+
+def move_subject(conn, subject_id, teacher_id):
+    # Предмет перейшов до іншого викладача; агрегатів за викладачем немає, змінюються лише оцінки
+    conn.execute(update(Grade.__table__).where(Grade.subject_id == subject_id).values(teacher_id=teacher_id))
+
+
+def fill_grade_owners(conn, grade_ids=None):
+    # group_id і teacher_id оцінок за поточними students/subjects: для переліку id або всієї таблиці
+    stmt = update(Grade.__table__).values(group_id=_GRADE_GROUP, teacher_id=_GRADE_TEACHER)
+    if grade_ids is None:
+        conn.execute(stmt)
+        return
+    grade_ids = sorted(grade_ids)
+    for i in range(0, len(grade_ids), IN_CHUNK):
+        conn.execute(stmt.where(Grade.id.in_(grade_ids[i:i + IN_CHUNK])))
+
+
+# --- Каскадне видалення ---
+# Оцінки студента чи предмета видаляє БД (ON DELETE CASCADE), групу й викладача в students/subjects
+# обнуляє теж вона (ON DELETE SET NULL). Подій для цих рядків немає, тож агрегати й денормалізовані
+# колонки поправляються до DELETE, поки залежні рядки ще на місці.
+
+def remove_grades(conn, condition, sign=-1):
+    # Віднімає з агрегатів оцінки, що відповідають condition, одним GROUP BY (рядки не завантажуються);
+    # sign=1 — додає їх назад
+    bucket = grade_bucket(Grade.grade)
+    query = (
+        select(Grade.student_id, Grade.subject_id, bucket,
+               func.sum(cast(Grade.grade, Numeric(14, 2))), func.count(Grade.id))
+        .where(condition, Grade.student_id.isnot(None), Grade.subject_id.isnot(None))
+        .group_by(Grade.student_id, Grade.subject_id, bucket)
+    )
+    apply_deltas(conn, {
+        (student_id, subject_id, bucket_id): [sign * Decimal(grade_sum), sign * grade_count]
+        for student_id, subject_id, bucket_id, grade_sum, grade_count in conn.execute(query)
+    })
+
+
+def prepare_delete(conn, model, ids):
+    # Викликається перед видаленням рядків model з переліку ids у тій самій транзакції
+    ids = list(ids)
+    if model is Student:
+        remove_grades(conn, Grade.student_id.in_(ids))
+    elif model is Subject:
+        remove_grades(conn, Grade.subject_id.in_(ids))
+    elif model is Group:
+        # Усі студенти групи лишаються без групи: її агрегати просто зникають
+        for name in ('group_subject_stats', 'group_grade_buckets'):
+            table = Base.metadata.tables[name]
+            conn.execute(delete(table).where(table.c.group_id.in_(ids)))
+        conn.execute(update(Grade.__table__)
+                     .where(Grade.student_id.in_(select(Student.id).where(Student.group_id.in_(ids))))
+                     .values(group_id=None))
+    elif model is Teacher:
+        conn.execute(update(Grade.__table__)
+                     .where(Grade.subject_id.in_(select(Subject.id).where(Subject.teacher_id.in_(ids))))
+                     .values(teacher_id=None))
+
+
+# --- Підтримка через події сесії ---
+
+def _before_flush(session, flush_context, instances):
+    deleted = defaultdict(list)
+    for obj in session.deleted:
+        deleted[type(obj)].append(obj.id)
+    cascading = [model for model in (Student, Subject, Group, Teacher) if deleted.get(model)]
+    if not cascading:
+        return
+    conn = session.connection()
+    for model in cascading:
+        prepare_delete(conn, model, deleted[model])
+
+
+def _committed(obj, attr):
+    # Значення атрибута до змін у поточному flush
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(obj, attr)
+
+
+def _after_flush(session, flush_context):
+    conn = session.connection()
+    deltas = defaultdict(lambda: [Decimal(0), 0])
+    owned = []
+    for obj in session.new:
+        if isinstance(obj, Grade):
+            grade_deltas([(obj.student_id, obj.subject_id, obj.grade)], 1, deltas)
+            owned.append(obj.id)
+    # Оцінки видалених у цьому flush студентів і предметів уже віднято в _before_flush
+    removed = {(type(obj), obj.id) for obj in session.deleted if isinstance(obj, (Student, Subject))}
+    for obj in session.deleted:
+        if isinstance(obj, Grade):
+            if ((Student, _committed(obj, 'student_id')) in removed
+                    or (Subject, _committed(obj, 'subject_id')) in removed):
+                continue
+            grade_deltas([(_committed(obj, 'student_id'), _committed(obj, 'subject_id'), _committed(obj, 'grade'))],
+                         -1, deltas)
+    for obj in session.dirty:
+        if isinstance(obj, Grade) and session.is_modified(obj):
+            grade_deltas([(_committed(obj, 'student_id'), _committed(obj, 'subject_id'), _committed(obj, 'grade'))],
+                         -1, deltas)
+            grade_deltas([(obj.student_id, obj.subject_id, obj.grade)], 1, deltas)
+            state = inspect(obj).attrs
+            if state.student_id.history.has_changes() or state.subject_id.history.has_changes():
+                owned.append(obj.id)
+    # Спершу переходи між групами — за станом агрегатів до нових оцінок цього flush
+    for obj in session.dirty:
+        if isinstance(obj, Student) and inspect(obj).attrs.group_id.history.has_changes():
+            history = inspect(obj).attrs.group_id.history
+            move_student(conn, obj.id, history.deleted[0] if history.deleted else None, obj.group_id, deltas)
+        elif isinstance(obj, Subject) and inspect(obj).attrs.teacher_id.history.has_changes():
+            move_subject(conn, obj.id, obj.teacher_id)
+    apply_deltas(conn, deltas)
+    if owned:
+        fill_grade_owners(conn, owned)
+
+
+# Масові session.query(...).update()/delete(), session.execute(insert/update/delete(...)) і
+# bulk_insert_mappings минають flush, тож зачеплені рядки визначаються до запиту, а агрегати
+# поправляються навколо нього
+_BULK_UPDATED = {model.__tablename__: model for model in (Grade, Student, Subject)}
+_BULK_DELETED = dict(_BULK_UPDATED, **{model.__tablename__: model for model in (Group, Teacher)})
+
+
+def _bulk_ids(conn, model, state):
+    if isinstance(state.parameters, list):
+        # Оновлення за первинним ключем: update(Model) з переліком словників
+        return [params['id'] for params in state.parameters]
+    query = select(model.id)
+    if state.statement.whereclause is not None:
+        query = query.where(state.statement.whereclause)
+    return conn.execute(query).scalars().all()
+
+
+def _in_chunks(ids):
+    for i in range(0, len(ids), IN_CHUNK):
+        yield ids[i:i + IN_CHUNK]
+
+
+def _inserted_rows(conn, state):
+    # Значення вставлених рядків: список словників execute(insert(Grade), rows) або .values(...);
+    # у багаторядковому .values([...]) параметри мають суфікси _m0, _m1, ...
+    if isinstance(state.parameters, list):
+        return state.parameters
+    if state.parameters:
+        return [state.parameters]
+    rows = defaultdict(dict)
+    for key, value in state.statement.compile(dialect=conn.dialect).params.items():
+        name, _, index = key.rpartition('_m')
+        if name and index.isdigit():
+            rows[int(index)][name] = value
+        else:
+            rows[0][key] = value
+    return [rows[index] for index in sorted(rows)]
+
+
+def last_grade_id(conn):
+    return conn.execute(select(func.max(Grade.id))).scalar() or 0
+
+
+def add_grades(conn, rows=None, after_id=None):
+    # Додає до агрегатів щойно вставлені оцінки й заповнює їхні group_id/teacher_id. Оцінки знаходяться
+    # за унікальним ключем (student_id, subject_id, date_received) з rows, а для INSERT ... SELECT — як
+    # id > after_id (last_grade_id до вставки)
+    key = tuple_(Grade.student_id, Grade.subject_id, Grade.date_received)
+    query = select(Grade.id, Grade.student_id, Grade.subject_id, Grade.grade)
+    if rows is None:
+        conditions = [Grade.id > after_id]
+    else:
+        keys = [(row.get('student_id'), row.get('subject_id'), row.get('date_received')) for row in rows]
+        keys = [k for k in keys if None not in k]
+        conditions = [key.in_(chunk) for chunk in _in_chunks(keys)]
+    deltas = defaultdict(lambda: [Decimal(0), 0])
+    ids = []
+    for condition in conditions:
+        for grade_id, student_id, subject_id, grade in conn.execute(query.where(condition)):
+            grade_deltas([(student_id, subject_id, grade)], 1, deltas)
+            ids.append(grade_id)
+    apply_deltas(conn, deltas)
+    if ids:
+        fill_grade_owners(conn, ids)
+
+
+def _bulk_insert(conn, state):
+    if getattr(state.statement, 'select', None) is not None:
+        after_id = last_grade_id(conn)
+        result = state.invoke_statement()
+        add_grades(conn, after_id=after_id)
+        return result
+    rows = _inserted_rows(conn, state)
+    result = state.invoke_statement()
+    add_grades(conn, rows)
+    return result
+
+
+def _do_orm_execute(state):
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return None
+    name = getattr(getattr(state.statement, 'table', None), 'name', None)
+    if state.is_insert:
+        return _bulk_insert(state.session.connection(), state) if name == Grade.__tablename__ else None
+    model = (_BULK_DELETED if state.is_delete else _BULK_UPDATED).get(name)
+    if model is None:
+        return None
+    conn = state.session.connection()
+    ids = _bulk_ids(conn, model, state)
+    if not ids:
+        return None
+    if state.is_delete:
+        if model is Grade:
+            for chunk in _in_chunks(ids):
+                remove_grades(conn, Grade.id.in_(chunk))
+        else:
+            prepare_delete(conn, model, ids)
+        return None
+    if model is Grade:
+        for chunk in _in_chunks(ids):
+            remove_grades(conn, Grade.id.in_(chunk))
+        result = state.invoke_statement()
+        for chunk in _in_chunks(ids):
+            remove_grades(conn, Grade.id.in_(chunk), sign=1)
+        fill_grade_owners(conn, ids)
+        return result
+    owner = model.group_id if model is Student else model.teacher_id
+    before = {}
+    for chunk in _in_chunks(ids):
+        before.update(conn.execute(select(model.id, owner).where(model.id.in_(chunk))).all())
+    result = state.invoke_statement()
+    for chunk in _in_chunks(ids):
+        for row_id, new in conn.execute(select(model.id, owner).where(model.id.in_(chunk))):
+            if new != before.get(row_id):
+                if model is Student:
+                    move_student(conn, row_id, before.get(row_id), new)
+                else:
+                    move_subject(conn, row_id, new)
+    return result
+
+
+class RollupSession(Session):
+    # bulk_insert_mappings не проходить через do_orm_execute: нові оцінки додаються до агрегатів тут
+    def bulk_insert_mappings(self, mapper, mappings, return_defaults=False, render_nulls=False):
+        if inspect(mapper).class_ is not Grade:
+            return super().bulk_insert_mappings(mapper, mappings, return_defaults, render_nulls)
+        mappings = list(mappings)
+        super().bulk_insert_mappings(mapper, mappings, return_defaults, render_nulls)
+        add_grades(self.connection(), mappings)
+
+
+def register(session_factory):
+    # Агрегати оновлюються в тій самій транзакції, що й зміни Grade/Student
+    for name, listener in (('before_flush', _before_flush), ('after_flush', _after_flush),
+                           ('do_orm_execute', _do_orm_execute)):
+        if not event.contains(session_factory, name, listener):
+            event.listen(session_factory, name, listener)
+
+
+# --- Повний перерахунок і перевірка ---
+
+def _full_queries():
+    grade_sum = func.sum(cast(Grade.grade, Numeric(14, 2)))
+    grade_count = func.count(Grade.id)
+    graded = and_(Grade.student_id.isnot(None), Grade.subject_id.isnot(None))
+    bucket = grade_bucket(Grade.grade)
+    return {
+        'student_subject_stats': select(Grade.student_id, Grade.subject_id, grade_sum, grade_count)
+        .where(graded).group_by(Grade.student_id, Grade.subject_id),
+        'student_stats': select(Grade.student_id, grade_sum, grade_count)
+        .where(graded).group_by(Grade.student_id),
+        'subject_stats': select(Grade.subject_id, grade_sum, grade_count)
+        .where(graded).group_by(Grade.subject_id),
+        'group_subject_stats': select(Student.group_id, Grade.subject_id, grade_sum, grade_count)
+        .join(Student, Student.id == Grade.student_id)
+        .where(graded, Student.group_id.isnot(None)).group_by(Student.group_id, Grade.subject_id),
+        'subject_grade_buckets': select(Grade.subject_id, bucket, grade_sum, grade_count)
+        .where(graded).group_by(Grade.subject_id, bucket),
+        'group_grade_buckets': select(Student.group_id, bucket, grade_sum, grade_count)
+        .join(Student, Student.id == Grade.student_id)
+        .where(graded, Student.group_id.isnot(None)).group_by(Student.group_id, bucket),
+    }
+
+
+def clear(conn):
+    for name in ROLLUP_KEYS:
+        conn.execute(delete(Base.metadata.tables[name]))
+
+
+def rebuild(conn):
+    clear(conn)
+    for name, query in _full_queries().items():
+        table = Base.metadata.tables[name]
+        conn.execute(insert(table).from_select([*ROLLUP_KEYS[name], 'grade_sum', 'grade_count'], query))
+        if name in RANKED_ROLLUPS:
+            conn.execute(update(table).values(avg_grade=func.round(table.c.grade_sum / table.c.grade_count, 2)))
+    fill_grade_owners(conn)
+
+
+def check(conn):
+    # Порівнює агрегати з повним перерахунком; повертає список розбіжностей
+    mismatches = []
+    for name, query in _full_queries().items():
+        table = Base.metadata.tables[name]
+        n_keys = len(ROLLUP_KEYS[name])
+        expected = {tuple(row[:n_keys]): (row[n_keys], row[n_keys + 1]) for row in conn.execute(query)}
+        columns = [table.c[k] for k in ROLLUP_KEYS[name]] + [table.c.grade_sum, table.c.grade_count]
+        if name in RANKED_ROLLUPS:
+            columns.append(table.c.avg_grade)
+        actual = {}
+        for row in conn.execute(select(*columns)):
+            actual[tuple(row[:n_keys])] = (row[n_keys], row[n_keys + 1])
+            # Збережене середнє має відповідати збереженим сумі та кількості
+            if name in RANKED_ROLLUPS and abs(
+                Decimal(str(row[n_keys + 2])) - Decimal(str(row[n_keys])) / row[n_keys + 1]
+            ) > Decimal('0.005'):
+                mismatches.append((name, tuple(row[:n_keys]), 'avg_grade', row[n_keys + 2]))
+        for key in expected.keys() | actual.keys():
+            want = expected.get(key, (0, 0))
+            got = actual.get(key, (0, 0))
+            if want[1] != got[1] or abs(Decimal(str(want[0])) - Decimal(str(got[0]))) >= Decimal('0.01'):
+                mismatches.append((name, key, want, got))
+    stale = conn.execute(
+        select(func.count()).select_from(Grade)
+        .where(or_(Grade.group_id.is_distinct_from(_GRADE_GROUP), Grade.teacher_id.is_distinct_from(_GRADE_TEACHER)))
+    ).scalar()
+    if stale:
+        mismatches.append(('grades', 'group_id/teacher_id', 0, f'{stale} застарілих'))
+    return mismatches
@@ -0,0 +1,117 @@
+import re
+import threading
+from array import array
+import numpy as np
+from sqlalchemy import select, func, or_
+from models import Student, Teacher, Subject
+from db import connection
+from my_select import prefix_filter
+import cache
+
+# Нечіткий пошук за частиною імені: PostgreSQL — pg_trgm (GIN-індекси, міграція 9d4f0b6e21c7),
+# інші БД — індекс триграм у пам'яті процесу. Результат — [(id, ім'я, оцінка 0..1)]:
+# спершу збіги за початком імені, далі за схожістю.
+SEARCH_FIELDS = {Student: 'fullname', Teacher: 'fullname', Subject: 'name'}
+SEARCH_LIMIT = 10
+# Коротші запити не мають вибіркових триграм — шукаються за початком імені по btree-індексу
+MIN_TRIGRAM_QUERY = 3
+# Мінімальна схожість для індексу в пам'яті (як pg_trgm.word_similarity_threshold)
+SIMILARITY_THRESHOLD = 0.6
+
+_WORD = re.compile(r'\w+')
+
+
+def trigrams(text):
+    # Як у pg_trgm: слова в нижньому регістрі, доповнені двома пробілами спереду й одним ззаду
+    result = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def search(model, query, limit=SEARCH_LIMIT):
+    attr = SEARCH_FIELDS[model]
+    query = query.strip()
+    if not query:
+        return []
+    with connection() as conn:
+        dialect = conn.dialect.name
+        if len(query) < MIN_TRIGRAM_QUERY:
+            column = getattr(model, attr)
+            rows = conn.execute(
+                select(model.id, column).where(prefix_filter(dialect, column, query)).order_by(model.id).limit(limit)
+            ).all()
+            return [(row_id, name, 1.0) for row_id, name in rows]
+        if dialect == 'postgresql':
+            return _search_pg(conn, model, attr, query, limit)
+    return _memory_index(model, attr).search(query, limit)
+
+
+def _search_pg(conn, model, attr, query, limit):
+    column = getattr(model, attr)
+    score = func.word_similarity(query, column)
+    rows = conn.execute(
+        select(model.id, column, score.label('score'))
+        # Обидві умови обслуговує GIN-індекс gin_trgm_ops
+        .where(or_(column.icontains(query, autoescape=True), column.op('%>')(query)))
+        .order_by(column.istartswith(query, autoescape=True).desc(), score.desc(), model.id)
+        .limit(limit)
+    ).all()
+    return [(row_id, name, float(value)) for row_id, name, value in rows]
+
+
+# --- Індекс триграм у пам'яті (SQLite та інші БД без pg_trgm) ---
+
+class TrigramIndex:
+    # Списки позицій для кожної триграми; збіги рахуються векторно (np.unique по об'єднаних списках)
+    def __init__(self, rows):
+        self.ids = np.array([row_id for row_id, _ in rows], dtype=np.int64)
+        self.names = [name for _, name in rows]
+        self.lowered = [name.lower() for name in self.names]
+        postings = {}
+        for position, name in enumerate(self.names):
+            for gram in trigrams(name):
+                postings.setdefault(gram, array('i')).append(position)
+        self.postings = {gram: np.frombuffer(positions, dtype=np.int32) for gram, positions in postings.items()}
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        grams = trigrams(query)
+        hits = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not hits:
+            return []
+        positions, shared = np.unique(np.concatenate(hits), return_counts=True)
+        # Частка триграм запиту, знайдених в імені (наближення word_similarity)
+        scores = shared / len(grams)
+        keep = scores >= SIMILARITY_THRESHOLD
+        positions, scores = positions[keep], scores[keep]
+        needle = query.lower()
+        not_prefix = np.array([not self.lowered[p].startswith(needle) for p in positions.tolist()], dtype=bool)
+        order = np.lexsort((self.ids[positions], -scores, not_prefix))[:limit]
+        return [(int(self.ids[positions[i]]), self.names[positions[i]], float(scores[i])) for i in order]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _memory_index(model, attr):
+    # Будується при першому пошуку; скидається разом із кешем при зміні таблиці
+    with _indexes_lock:
+        index = _indexes.get(model.__tablename__)
+        if index is None:
+            with connection() as conn:
+                rows = conn.execute(select(model.id, getattr(model, attr)).order_by(model.id)).all()
+            index = _indexes[model.__tablename__] = TrigramIndex(rows)
+        return index
+
+
+def _drop_indexes(tables):
+    with _indexes_lock:
+        if tables is None:
+            _indexes.clear()
+        for table in tables or ():
+            _indexes.pop(table, None)
+
+
+cache.on_invalidate(_drop_indexes)
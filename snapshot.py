@@ -0,0 +1,211 @@
+import json
+import time
+import struct
+import numpy as np
+from sqlalchemy import select, func, and_
+from models import Group, Teacher, Subject, Student, Grade
+from bulk_seed import insert_rows, sync_sequence, reset, _report, BATCH_SIZE
+import rollups
+
+# Колонковий знімок grades і довідників в одному файлі.
+# Формат: 8 байт MAGIC, два uint64 (зсув і довжина JSON-заголовка), далі колонки фіксованої ширини,
+# вирівняні на ALIGN байт, і JSON-заголовок у кінці файлу. Рядки — як в Arrow: масив зсувів int64
+# (n+1) плюс UTF-8 байти. Дата — int32, номер дня від 1970-01-01. NULL у зовнішніх ключах — -1.
+# Оцінки впорядковані за (student_id, subject_id, date_received), тож аналітика читає їх без сортування.
+# Числові колонки відкриваються через np.memmap без копіювання.
+MAGIC = b'GRDSNAP1'
+PREAMBLE = struct.Struct('<8sQQ')
+ALIGN = 64
+VERSION = 1
+EPOCH = np.datetime64('1970-01-01', 'D')
+
+# таблиця -> (модель, [(колонка, тип)]); типи: int32, float32, date, str
+TABLES = {
+    'groups': (Group, [('id', 'int32'), ('name', 'str')]),
+    'teachers': (Teacher, [('id', 'int32'), ('fullname', 'str')]),
+    'subjects': (Subject, [('id', 'int32'), ('name', 'str'), ('teacher_id', 'int32')]),
+    'students': (Student, [('id', 'int32'), ('fullname', 'str'), ('group_id', 'int32')]),
+    'grades': (Grade, [('student_id', 'int32'), ('subject_id', 'int32'), ('grade', 'float32'),
+                       ('date_received', 'date')]),
+}
+STORAGE = {'int32': np.int32, 'float32': np.float32, 'date': np.int32}
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _pad(f):
+    position = f.tell()
+    if position % ALIGN:
+        f.write(b'\0' * (ALIGN - position % ALIGN))
+    return f.tell()
+
+
+def _write_array(f, array):
+    offset = _pad(f)
+    f.write(np.ascontiguousarray(array).tobytes())
+    return {'offset': offset, 'dtype': array.dtype.str, 'count': len(array)}
+
+
+def _encode_strings(values):
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+
+def _column_values(values, kind):
+    if kind == 'str':
+        return values
+    if kind == 'date':
+        return (np.array(values, dtype='datetime64[D]') - EPOCH).astype(np.int32)
+    return np.array([-1 if value is None else value for value in values], dtype=STORAGE[kind])
+
+
+def _write_column(f, values, kind):
+    if kind == 'str':
+        offsets, data = _encode_strings(values)
+        return {'kind': kind, 'offsets': _write_array(f, offsets), 'data': _write_array(f, data)}
+    return dict(_write_array(f, _column_values(values, kind)), kind=kind)
+
+
+def export(conn, path, batch_size=BATCH_SIZE):
+    # Для узгодженого знімка conn має бути в одній транзакції (REPEATABLE READ у PostgreSQL)
+    header = {'version': VERSION, 'tables': {}}
+    with open(path, 'w+b') as f:
+        f.write(b'\0' * PREAMBLE.size)
+        for name, (model, columns) in TABLES.items():
+            if name == 'grades':
+                continue
+            t0 = time.perf_counter()
+            rows = conn.execute(
+                select(*(getattr(model, column) for column, _ in columns)).order_by(model.id)
+            ).all()
+            values = list(zip(*rows)) if rows else [()] * len(columns)
+            header['tables'][name] = {
+                'rows': len(rows),
+                'columns': {column: _write_column(f, list(column_values), kind)
+                            for (column, kind), column_values in zip(columns, values)},
+            }
+            _report(name, len(rows), time.perf_counter() - t0)
+
+        # Оцінки йдуть потоком: місце під кожну колонку виділяється наперед, чанки пишуться на свої зсуви
+        t0 = time.perf_counter()
+        model, columns = TABLES['grades']
+        graded = and_(Grade.student_id.isnot(None), Grade.subject_id.isnot(None))
+        total = conn.execute(select(func.count()).select_from(Grade).where(graded)).scalar()
+        layout = {}
+        for column, kind in columns:
+            itemsize = np.dtype(STORAGE[kind]).itemsize
+            offset = _pad(f)
+            layout[column] = {'offset': offset, 'dtype': np.dtype(STORAGE[kind]).str, 'count': total, 'kind': kind}
+            f.seek(offset + total * itemsize)
+        end = f.tell()
+        query = (
+            select(*(getattr(Grade, column) for column, _ in columns))
+            .where(graded)
+            .order_by(Grade.student_id, Grade.subject_id, Grade.date_received)
+            .execution_options(yield_per=batch_size)
+        )
+        written = 0
+        for rows in conn.execute(query).partitions():
+            if written + len(rows) > total:
+                raise SnapshotError("Оцінки змінилися під час експорту; потрібна одна транзакція")
+            for (column, kind), column_values in zip(columns, zip(*rows)):
+                array = _column_values(column_values, kind)
+                f.seek(layout[column]['offset'] + written * array.itemsize)
+                f.write(array.tobytes())
+            written += len(rows)
+        if written != total:
+            raise SnapshotError("Оцінки змінилися під час експорту; потрібна одна транзакція")
+        header['tables']['grades'] = {'rows': total, 'columns': layout}
+        _report('grades', total, time.perf_counter() - t0)
+
+        f.seek(end)
+        header_offset = _pad(f)
+        payload = json.dumps(header).encode('utf-8')
+        f.write(payload)
+        f.seek(0)
+        f.write(PREAMBLE.pack(MAGIC, header_offset, len(payload)))
+    return header
+
+
+class Snapshot:
+    # Відкритий знімок: числові колонки — np.memmap (лише читання), рядки декодуються за запитом
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, header_offset, header_len = PREAMBLE.unpack(f.read(PREAMBLE.size))
+            if magic != MAGIC:
+                raise SnapshotError(f"{path}: не файл знімка")
+            f.seek(header_offset)
+            self.header = json.loads(f.read(header_len))
+        if self.header.get('version') != VERSION:
+            raise SnapshotError(f"{path}: непідтримувана версія {self.header.get('version')}")
+
+    def rows(self, table):
+        return self.header['tables'][table]['rows']
+
+    def _array(self, spec):
+        if not spec['count']:
+            return np.empty(0, dtype=spec['dtype'])
+        return np.memmap(self.path, dtype=spec['dtype'], mode='r', offset=spec['offset'], shape=(spec['count'],))
+
+    def column(self, table, column):
+        spec = self.header['tables'][table]['columns'][column]
+        if spec['kind'] != 'str':
+            return self._array(spec)
+        offsets, data = self._array(spec['offsets']), self._array(spec['data'])
+        raw = data.tobytes() if len(data) else b''
+        bounds = offsets.tolist()
+        return np.array([raw[bounds[i]:bounds[i + 1]].decode('utf-8') for i in range(len(bounds) - 1)],
+                        dtype=object)
+
+    def iter_rows(self, table, batch_size=BATCH_SIZE):
+        # Рядки для вставки в БД: словники з типами Python, NULL замість -1
+        columns = TABLES[table][1]
+        names = [column for column, _ in columns]
+        arrays = [self.column(table, column) for column in names]
+        for start in range(0, self.rows(table), batch_size):
+            values = []
+            for (column, kind), array in zip(columns, arrays):
+                part = array[start:start + batch_size]
+                if kind == 'date':
+                    values.append((EPOCH + part).tolist())
+                elif kind == 'float32':
+                    values.append([round(value, 2) for value in part.astype(np.float64).tolist()])
+                elif kind == 'int32' and column != 'id':
+                    values.append([None if value < 0 else value for value in part.tolist()])
+                else:
+                    values.append(part.tolist())
+            yield from (dict(zip(names, row)) for row in zip(*values))
+
+
+def open_snapshot(path):
+    return Snapshot(path)
+
+
+def restore(engine, path, overwrite=False, batch_size=BATCH_SIZE):
+    # Заповнює БД зі знімка (id довідників зберігаються); без overwrite база має бути порожньою
+    snapshot = open_snapshot(path)
+    total_rows = 0
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        if overwrite:
+            reset(conn)
+        else:
+            for model in (Group, Teacher, Subject, Student, Grade):
+                if conn.execute(select(func.count()).select_from(model)).scalar():
+                    raise SnapshotError(f"Таблиця {model.__tablename__} не порожня; потрібен режим overwrite")
+        for name, (model, _) in TABLES.items():
+            t0 = time.perf_counter()
+            n_rows = insert_rows(conn, model.__table__, snapshot.iter_rows(name, batch_size), batch_size)
+            sync_sequence(conn, model.__table__)
+            total_rows += n_rows
+            _report(name, n_rows, time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        rollups.rebuild(conn)
+        _report('rollups', snapshot.rows('grades'), time.perf_counter() - t0)
+    _report('усього', total_rows, time.perf_counter() - started)
+    return total_rows
@@ -0,0 +1,61 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Кеш my_select читає налаштування під час імпорту: у тестах кожен виклик іде в БД
+os.environ['DB_CACHE_TTL'] = '0'
+
+import db  # noqa: E402
+import rollups  # noqa: E402
+from bulk_seed import bulk_seed  # noqa: E402
+from db import _sqlite_foreign_keys  # noqa: E402
+from models import Base, Group, Teacher, Subject, Student, Grade  # noqa: E402
+
+# Одна фабрика на всі тести: SQLAlchemy розрізняє цілі подій за id(), і нова фабрика на місці зібраної
+# збирачем сміття могла б вважатися вже зареєстрованою в rollups.register
+Session = sessionmaker(class_=rollups.RollupSession)
+rollups.register(Session)
+
+
+def _engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    event.listen(engine, 'connect', _sqlite_foreign_keys)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def session(tmp_path):
+    # Окрема SQLite-база на тест: 2 групи, 1 викладач, 2 предмети, 4 студенти, по оцінці з кожного предмета
+    engine = _engine(tmp_path)
+    with Session(bind=engine) as session:
+        groups = [Group(name=f'G{i}') for i in (1, 2)]
+        teacher = Teacher(fullname='Teacher One')
+        subjects = [Subject(name=f'S{i}', teacher=teacher) for i in (1, 2)]
+        students = [Student(fullname=f'Student {i}', group=groups[i % 2]) for i in range(4)]
+        session.add_all([*groups, teacher, *subjects, *students])
+        session.flush()
+        session.add_all([
+            Grade(student_id=student.id, subject_id=subject.id, grade=70 + 5 * i + j,
+                  date_received=date(2024, 1, 1 + j))
+            for i, student in enumerate(students) for j, subject in enumerate(subjects)
+        ])
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def seeded_engine(tmp_path, monkeypatch):
+    # Детермінований набір bulk_seed; my_select звертається до db.get_engine(), тож підставляється engine тесту
+    engine = _engine(tmp_path)
+    bulk_seed(engine, overwrite=True, n_groups=3, n_teachers=4, n_subjects=6, n_students=60, n_grades=5,
+              seed=20240601, anchor_date=date(2024, 6, 1))
+    monkeypatch.setattr(db, '_engine', engine)
+    yield engine
+    engine.dispose()
@@ -0,0 +1,17 @@
+import analytics
+import my_select
+import snapshot
+
+
+def test_loaded_engine_matches_sql(seeded_engine):
+    with seeded_engine.connect() as conn:
+        data = analytics.load(conn)
+    assert analytics.check(data, my_select) == []
+
+
+def test_snapshot_engine_matches_sql(seeded_engine, tmp_path):
+    path = str(tmp_path / 'grades.snap')
+    with seeded_engine.connect() as conn:
+        snapshot.export(conn, path)
+    data = analytics.GradeAnalytics.from_snapshot(snapshot.open_snapshot(path))
+    assert analytics.check(data, my_select) == []
@@ -0,0 +1,63 @@
+from datetime import date
+
+from sqlalchemy import select, insert, update, delete
+
+import rollups
+from models import Group, Subject, Student, Grade
+
+
+def mismatches(session):
+    return rollups.check(session.connection())
+
+
+def test_expired_grade_edit(session):
+    # Після commit() об'єкт протермінований: старе значення оцінки має братися з БД, а не з нового
+    grade = session.scalars(select(Grade).order_by(Grade.id)).first()
+    session.commit()
+    grade.grade = 61.5
+    session.commit()
+    assert mismatches(session) == []
+
+
+def test_expired_student_group_change(session):
+    student = session.scalars(select(Student).order_by(Student.id)).first()
+    other = session.scalars(select(Group).where(Group.id != student.group_id)).first()
+    student.group_id = other.id
+    session.commit()
+    student.group_id = None
+    session.commit()
+    assert mismatches(session) == []
+
+
+def test_bulk_grade_update_and_delete(session):
+    session.execute(update(Grade).where(Grade.grade < 80).values(grade=Grade.grade + 10))
+    session.query(Grade).filter(Grade.grade > 90).delete()
+    session.commit()
+    assert mismatches(session) == []
+
+
+def test_bulk_grade_insert(session):
+    rows = [{'student_id': student_id, 'subject_id': subject_id, 'grade': 60 + student_id + subject_id,
+             'date_received': date(2024, 2, 1)} for student_id in (1, 2, 3) for subject_id in (1, 2)]
+    session.execute(insert(Grade), rows[:2])
+    session.execute(insert(Grade).values(rows[2]))
+    session.execute(insert(Grade).values(rows[3:5]))
+    session.bulk_insert_mappings(Grade, rows[5:])
+    session.commit()
+    assert session.scalar(select(Grade.id).where(Grade.group_id.is_(None))) is None
+    assert mismatches(session) == []
+
+
+def test_bulk_owner_update(session):
+    session.execute(update(Student).values(group_id=None))
+    session.query(Subject).update({'teacher_id': None})
+    session.commit()
+    assert mismatches(session) == []
+
+
+def test_cascading_delete(session):
+    session.delete(session.get(Student, 1))
+    session.execute(delete(Group).where(Group.id == 1))
+    session.commit()
+    assert session.scalars(select(Grade).where(Grade.student_id == 1)).all() == []
+    assert mismatches(session) == []
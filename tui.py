@@ -0,0 +1,331 @@
+import os
+from models import Group, Student, Teacher, Subject
+from db import session_scope
+from metrics import label
+from my_select import (
+    select_1, select_2, select_3, select_4, select_5, select_6, select_8, select_9,
+    iter_select_7, iter_select_10, iter_names, page_names, transcript,
+)
+
+# Інтерактивне меню (TUI). Завантажується з seed.py лише без аргументів командного рядка.
+try:
+    import msvcrt
+    HAS_MSVCRT = True
+except ImportError:
+    HAS_MSVCRT = False
+
+MENU_MAIN = [
+    "CRUD шаблони (argparse)",
+    "Select-запити",
+    "Перегляд складу",
+    "Поле введення команди",
+    "Вихід"
+]
+MODELS_UI = [
+    ("Викладачі", Teacher, "fullname"),
+    ("Групи", Group, "name"),
+    ("Студенти", Student, "fullname"),
+    ("Предмети", Subject, "name"),
+]
+ACTIONS = ["Створити", "Список", "Оновити", "Видалити"]
+SELECTS = [
+    ("Топ-5 студентів за середнім балом", select_1, None, None),
+    ("Студенти з найвищим середнім по предмету", select_2, Subject, "name"),
+    ("Середній бал у групі по предмету", select_3, Subject, "name"),
+    ("Середній бал по всіх групах", select_4, None, None),
+    ("Курси, які читає викладач", select_5, Teacher, "fullname"),
+    ("Список студентів у групі", select_6, Group, "name"),
+    ("Оцінки студентів у групі по предмету", iter_select_7, (Group, Subject), ("name", "name")),
+    ("Середній бал викладача", select_8, Teacher, "fullname"),
+    ("Курси, які відвідує студент", select_9, Student, "fullname"),
+    ("Оцінки студента по предмету", iter_select_10, (Student, Subject), ("fullname", "name")),
+    ("Табель студента", lambda student_id: transcript_lines(transcript(student_id)), Student, "fullname"),
+]
+BROWSE = ["Групи", "Викладачі", "Студенти"]
+COMMAND_TEMPLATES = [
+    'python seed.py -a create -m Student -n "NAME"',
+    'python seed.py -a update -m Teacher -n "NAME"',
+    'python seed.py -a remove -m Group --id 1',
+    'python seed.py -a list -m Subject',
+    'або ваша команда'
+]
+
+def clear():
+    os.system('cls' if os.name == 'nt' else 'clear')
+
+def print_menu(title, items, selected):
+    clear()
+    print(f"\n  {title}\n" + "=" * (len(title) + 2))
+    for i, item in enumerate(items):
+        prefix = "→ " if i == selected else "  "
+        print(f"{prefix}{item}")
+    print("\nСтрілки або W — вгору, S — вниз, Enter — обрати, Esc — назад/вихід або введіть номер пункту")
+
+def input_text(prompt):
+    print(f"\n{prompt}")
+    return input("> ")
+
+def menu_select(items, title="Меню"):
+    selected = 0
+    while True:
+        print_menu(title, items, selected)
+        if HAS_MSVCRT:
+            key = msvcrt.getch()
+            if key == b'\xe0':
+                arrow = msvcrt.getch()
+                if arrow == b'P':
+                    selected = (selected + 1) % len(items)
+                elif arrow == b'H':
+                    selected = (selected - 1) % len(items)
+            elif key == b'\r':
+                return selected
+            elif key == b'\x1b':
+                return None
+            elif key.isdigit():
+                idx = int(key)
+                if 0 <= idx < len(items):
+                    return idx
+            elif key.decode(errors='ignore').lower() in ['w', 'ц']:
+                selected = (selected - 1) % len(items)
+            elif key.decode(errors='ignore').lower() in ['s', 'ы', 'і']:
+                selected = (selected + 1) % len(items)
+        else:
+            inp = input().strip().lower()
+            if inp == '':
+                return selected
+            if inp == 'esc':
+                return None
+            if inp in ['w', 'ц']:
+                selected = (selected - 1) % len(items)
+            elif inp in ['s', 'ы', 'і']:
+                selected = (selected + 1) % len(items)
+            elif inp.isdigit():
+                idx = int(inp) - 1
+                if 0 <= idx < len(items):
+                    return idx
+
+# --- Вибір об'єкта посторінково ---
+# Екран показує лише поточну сторінку (PAGE_SIZE рядків), наступна/попередня читаються за ключем id,
+# тож перемальовування й навігація не залежать від кількості записів у таблиці.
+
+def print_page(title, rows, selected, prefix):
+    clear()
+    print(f"\n  {title}" + (f"  [пошук: {prefix}]" if prefix else "") + "\n" + "=" * (len(title) + 2))
+    if not rows:
+        print("  Нічого не знайдено")
+    for i, (obj_id, value) in enumerate(rows):
+        prefix_mark = "→ " if i == selected else "  "
+        print(f"{prefix_mark}{obj_id}: {value}")
+    print("\nW/S — вгору/вниз, A/D — сторінка назад/вперед, / — пошук за початком імені, "
+          "Enter — обрати, Esc — назад або номер рядка на сторінці")
+
+def read_command():
+    # Натискання клавіші -> (команда, аргумент)
+    if HAS_MSVCRT:
+        key = msvcrt.getch()
+        if key == b'\xe0':
+            return {b'H': ('up', None), b'P': ('down', None), b'K': ('prev', None),
+                    b'M': ('next', None)}.get(msvcrt.getch(), (None, None))
+        if key == b'\r':
+            return 'enter', None
+        if key == b'\x1b':
+            return 'esc', None
+        if key == b'/':
+            return 'search', input_text("Початок імені (порожньо — без фільтра):").strip()
+        if key.isdigit():
+            return 'number', int(key)
+        inp = key.decode(errors='ignore').lower()
+    else:
+        inp = input().strip()
+        if inp == '':
+            return 'enter', None
+        if inp.startswith('/'):
+            return 'search', inp[1:].strip()
+        if inp.isdigit():
+            return 'number', int(inp)
+        inp = inp.lower()
+    commands = {'w': 'up', 'ц': 'up', 's': 'down', 'ы': 'down', 'і': 'down',
+                'a': 'prev', 'ф': 'prev', 'd': 'next', 'в': 'next', 'esc': 'esc'}
+    return commands.get(inp), None
+
+def pick_object(model, attr, title):
+    # id обраного об'єкта або None
+    prefix = ''
+    rows = page_names(model, attr)
+    if not rows:
+        print(f"Немає об'єктів для вибору {model.__name__}")
+        input("\nНажміть Enter для повернення...")
+        return None
+    selected = 0
+    while True:
+        print_page(title, rows, selected, prefix)
+        command, value = read_command()
+        if command == 'esc':
+            return None
+        if command == 'enter' and rows:
+            return rows[selected][0]
+        if command == 'number' and 1 <= value <= len(rows):
+            return rows[value - 1][0]
+        if command == 'search':
+            prefix = value
+            rows, selected = page_names(model, attr, prefix=prefix), 0
+        elif command in ('down', 'next') and rows:
+            if command == 'down' and selected < len(rows) - 1:
+                selected += 1
+                continue
+            page = page_names(model, attr, after=rows[-1][0], prefix=prefix)
+            if page:
+                rows, selected = page, 0
+        elif command in ('up', 'prev') and rows:
+            if command == 'up' and selected > 0:
+                selected -= 1
+                continue
+            page = page_names(model, attr, before=rows[0][0], prefix=prefix)
+            if page:
+                rows, selected = page, (len(page) - 1 if command == 'up' else 0)
+
+def crud_flow():
+    argparse_map = {
+        "Створити": lambda m, v: f"python seed.py -a create -m {m} -n \"{v}\"",
+        "Список":   lambda m, v: f"python seed.py -a list -m {m}",
+        "Оновити": lambda m, v: f"python seed.py -a update -m {m} --id {v[0]} -n \"{v[1]}\"",
+        "Видалити": lambda m, v: f"python seed.py -a remove -m {m} --id {v}",
+    }
+    while True:
+        idx_model = menu_select([m[0] for m in MODELS_UI], "CRUD: Оберіть сутність")
+        if idx_model is None:
+            return
+        model_name, model_cls, attr_name = MODELS_UI[idx_model]
+        idx_action = menu_select(ACTIONS, f"{model_name}: дія")
+        if idx_action is None:
+            continue
+        action = ACTIONS[idx_action]
+        with label('tui.crud'), session_scope() as session:
+            if action == "Список":
+                print(f"\nСписок {model_name}:")
+                for obj_id, value in iter_names(model_cls, attr_name):
+                    print(f"{obj_id}: {value}")
+                print(f"\nШаблон команди: {argparse_map['Список'](model_name[:-1], None)}")
+                input("\nНажміть Enter для повернення...")
+            elif action == "Створити":
+                name = input_text(f"Введіть ім'я для {model_name[:-1]}:")
+                print(f"\nШаблон команди: {argparse_map['Створити'](model_name[:-1], name)}")
+                confirm = input("Виконати? (Enter — так, будь-який символ — ні): ")
+                if confirm.strip() != "":
+                    continue
+                obj = model_cls(**{attr_name: name})
+                session.add(obj)
+                session.commit()
+                print(f"Створено: {obj}")
+                input("\nНажміть Enter для повернення...")
+            elif action in ["Оновити", "Видалити"]:
+                obj_id = pick_object(model_cls, attr_name, f"Оберіть {model_name[:-1]}")
+                if obj_id is None:
+                    continue
+                obj = session.get(model_cls, obj_id)
+                if action == "Оновити":
+                    new_val = input_text(f"Нове ім'я для {model_name[:-1]}:")
+                    print(f"\nШаблон команди: {argparse_map['Оновити'](model_name[:-1], (obj.id, new_val))}")
+                    confirm = input("Виконати? (Enter — так, будь-який символ — ні): ")
+                    if confirm.strip() != "":
+                        continue
+                    setattr(obj, attr_name, new_val)
+                    session.commit()
+                    print(f"Оновлено: {obj}")
+                    input("\nНажміть Enter для повернення...")
+                elif action == "Видалити":
+                    print(f"\nШаблон команди: {argparse_map['Видалити'](model_name[:-1], obj.id)}")
+                    confirm = input("Видалити? (Enter — так, будь-який символ — ні): ")
+                    if confirm.strip() != "":
+                        continue
+                    session.delete(obj)
+                    session.commit()
+                    print(f"Видалено: {obj}")
+                    input("\nНажміть Enter для повернення...")
+
+def select_flow():
+    while True:
+        idx = menu_select([s[0] for s in SELECTS], "Select-запити")
+        if idx is None:
+            return
+        title, func, models, attrs = SELECTS[idx]
+        if models is None:
+            result = func()
+        else:
+            if not isinstance(models, tuple):
+                models, attrs = (models,), (attrs,)
+            params = []
+            for m, attr in zip(models, attrs):
+                obj_id = pick_object(m, attr, f"Оберіть {m.__name__}")
+                if obj_id is None:
+                    return
+                params.append(obj_id)
+            result = func(*params)
+        print("\nРезультат:")
+        # --- Виправлення: якщо результат не ітерований, обернути в список ---
+        if result is None:
+            print("Немає даних")
+        elif isinstance(result, (str, int, float)):
+            print(result)
+        elif not hasattr(result, '__iter__') or isinstance(result, dict):
+            print(result)
+        elif isinstance(result, tuple):
+            print(*result)
+        else:
+            for row in result:
+                print(row)
+        input("\nНажміть Enter для повернення...")
+
+def transcript_lines(data):
+    # Табель у вигляді рядків для виводу select_flow
+    if data is None:
+        return None
+    rank = f"{data['rank']} з {data['group_size']}" if data['rank'] is not None else "—"
+    lines = [f"{data['student']}, група {data['group'] or '—'}: середній бал {data['average'] or '—'}, місце в групі {rank}"]
+    for subject in data['subjects']:
+        grades = ', '.join(f"{grade:g} ({day:%d.%m.%y})" for grade, day in subject['grades'])
+        lines.append(f"  {subject['subject']} (середній {subject['average']}): {grades}")
+    return lines
+
+def browse_flow():
+    idx = menu_select(BROWSE, "Перегляд складу")
+    if idx is None:
+        return
+    # Рядки друкуються в міру надходження з серверного курсора
+    model, attr = [(Group, 'name'), (Teacher, 'fullname'), (Student, 'fullname')][idx]
+    for obj_id, value in iter_names(model, attr):
+        print(f"{obj_id}: {value}")
+    input("\nНажміть Enter для повернення...")
+
+def command_input_flow():
+    while True:
+        clear()
+        print("\n--- Поле введення команди ---\n")
+        print("Приклади шаблонів:")
+        for t in COMMAND_TEMPLATES:
+            print(f"  {t}")
+        print("\nВведіть свою команду або Enter для повернення:")
+        cmd = input('> ').strip()
+        if not cmd:
+            return
+        print(f"\nВиконати команду: {cmd}")
+        confirm = input("Enter — виконати, будь-який символ — скасувати: ")
+        if confirm.strip() != "":
+            continue
+        os.system(cmd)
+        input("\nНажміть Enter для повернення...")
+
+def main():
+    while True:
+        idx = menu_select(MENU_MAIN, "Головне меню")
+        if idx is None or idx == len(MENU_MAIN) - 1:
+            print("Вихід...")
+            break
+        elif idx == 0:
+            crud_flow()
+        elif idx == 1:
+            select_flow()
+        elif idx == 2:
+            browse_flow()
+        elif idx == 3:
+            command_input_flow()